@@ -0,0 +1,26 @@
+"""
+Ability trees. Membership is declared here, by ability key; see utilities.abilities
+for the lookups and typeclasses.characters for each character's tree levels.
+"""
+from typeclasses.abilities import AbilityTree
+
+class PhysicalProwess(AbilityTree):
+    def __init__(self):
+        super().__init__()
+        self.key = "physical_prowess"
+        self.name = "Physical Prowess"
+        self.members = ("strength", "speed", "acrobatics")
+        self._description = "You are greater than the sum of your parts. Through careful honing and conditioning of your body, and through considerable discipline, you become capable of incredible things."
+        self.tiers = {
+            1: ("You no longer become tired from certain mundane tasks."),
+            3: ("You gain slightly increased Endurance regeneration."),
+            5: ("cmd: nap", "You have learned to carefully regulate yourself, and can nap once a day, getting a full day's sleep in only a few minutes.", "For each level in Physical Prowess, you can carry +60 kg of weight in items and equipment."),
+        }
+
+class Sensory(AbilityTree):
+    def __init__(self):
+        super().__init__()
+        self.key = "sensory"
+        self.name = "Sensory"
+        self.members = ("vision",)
+        self._description = "Each AP invested into a Sensory ability increases the ability to passively sense hidden things."
@@ -6,15 +6,29 @@ Commands describe the input the account can do to the game.
 """
 # Python modules.
 import textwrap
+from functools import wraps
 
 # Evennia modules.
 from evennia import Command as BaseCommand
 # from evennia import default_cmds
 
 # Blackbirds modules.
+from utilities import output
 from utilities.string import (jright, jleft)
 
 
+def _closes_output_on_error(method):
+    # A command that raises never reaches at_post_cmd, so its caller's output buffer is closed here instead.
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        try:
+            return method(self, *args, **kwargs)
+        except Exception:
+            output.abort(self.caller)
+            raise
+
+    return wrapper
+
 class Command(BaseCommand):
     """
     Inherit from this if you want to create your own command styles
@@ -35,6 +49,12 @@ class Command(BaseCommand):
             every command, like prompts.
 
     """
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        for name in ("parse", "func"):
+            if name in cls.__dict__:
+                setattr(cls, name, _closes_output_on_error(cls.__dict__[name]))
+
     def __init__(self):
         # Maintain out-of-the-box Evennia command structure.
         super().__init__()
@@ -58,6 +78,9 @@ class Command(BaseCommand):
             self.caller.error_echo("You cannot act yet.", prompt = True)
             return True
 
+        # Everything the command sends is collected, and goes out in one message per character afterwards.
+        output.begin(self.caller)
+
         # Space out everything between prompts - looks nice.
         if not self.no_prespacing:
             self.caller.echo("\n")
@@ -74,9 +97,16 @@ class Command(BaseCommand):
         if self.uses_balance and self.balance_time > 0:
             self.caller.use_balance(self.balance_time)
 
-        # Every command sends a prompt afterwards.
+        # Send everything the command collected.
+        output.end(self.caller)
+
+        # Every command sends a prompt afterwards. Queued, so it's only sent the once however
+        # many messages asked for one along the way.
         if not self.no_prompt:
-            self.caller.msg(prompt = self.caller.prompt())
+            if hasattr(self.caller, "queue_prompt"):
+                self.caller.queue_prompt()
+            else:
+                self.caller.msg(prompt = self.caller.prompt())
 
         self.balance_mod = 0
 
@@ -6,24 +6,38 @@ The ability's commands themselves are not implemented here.
 
 from commands.command import Command
 from typeclasses.abilities import Ability
-from utilities.abilities import ability_list, ability_search, get_ability_name, get_ability_description, get_ability_tiers
+from utilities.abilities import ability_list, ability_search, ability_tree, all_trees, get_ability_name, get_ability_description, get_ability_tiers
 from utilities.display import header, divider, column
 from utilities.string import jleft, jright, wrap
 
+def _ability_line(ab_list, ab, lvl):
+    lvl_string = f"|500{'||' * lvl}|100{'||' * (3 - lvl)}|n"
+    return f"\n{' ' * 3}{lvl_string} {ab_list[ab]['name']}"
+
 def list_player_abilities(ply):
     ab_list = ability_list()
 
     string = header("Abilities", color = "m", title_color = "M")
 
+    # Trees first, each with the abilities in it.
+    for tree in all_trees():
+        if not ply.tree_unlocked(tree.key):
+            continue
+
+        t_lvl = ply.tree_level(tree.key)
+        string += f"\n |M{'||' * t_lvl}|x{'_' * (tree.max_level() - t_lvl)}|n |W{tree.name.upper()}|n"
+        for ab in tree.members:
+            lvl = ply.ability_level(ab)
+            if lvl > 0 and ab in ab_list:
+                string += _ability_line(ab_list, ab, lvl)
+
     for ab, lvl in ply.db.abilities.items():
-        # Skip over abilities that may have been removed from the game, or
-        # are not accessible for whatever reason.
-        if not ab in ab_list:
+        # Skip over abilities that may have been removed from the game, are
+        # not accessible for whatever reason, or were listed under their tree.
+        if not ab in ab_list or ability_tree(ab):
             continue
 
-        lvl_string = f"|500{'||' * lvl}|100{'||' * (3 - lvl)}|n"
-        ab_name = ab_list[ab]["name"]
-        string += f"\n{' ' * 3}{lvl_string} {ab_name}"
+        string += _ability_line(ab_list, ab, lvl)
 
     string += "\n" + divider(color = "m")
     ply.echo(string)
@@ -32,7 +46,7 @@ def display_ability_info(ply, ab):
     name = get_ability_name(ab)
     desc = get_ability_description(ab)
     tiers = get_ability_tiers(ab)
-    lvl = ply.db.abilities[ab]
+    lvl = ply.ability_level(ab)
 
     string = header(f"{name} Lv. {lvl}", color = "m", title_color = "M")
     string += f"\n{desc}\n"
@@ -14,12 +14,14 @@ from commands.command import Command
 
 from data import visibility as vis
 
-from utilities.abilities import ability_list
+from utilities.abilities import ability_list, all_abilities, rebuild as rebuild_abilities
 from utilities.classes import class_from_name
 from utilities.debugging import debug_echo
 from utilities.display import notify, bullet, header, divider, gecho
 from utilities.menu import Menu
 from utilities.room import inc_roomname, get_room
+from utilities.string import jleft, jright
+from utilities.timing import summary, timing_keys, reset
 
 from server.conf import settings
 
@@ -29,9 +31,11 @@ from typeclasses.areas import Area
 from typeclasses.characters import Character
 from typeclasses.environments import Environment
 from typeclasses.objects import Object
-from typeclasses.species import Species, Human, Carven, Sacrilite, Luum, Idol, Blackbird
+from typeclasses.species import all_species, get_species
 from typeclasses.zones import Zone
 
+from world import tick
+
 class CmdReload(Command):
     """
     reload the server
@@ -65,7 +69,7 @@ class CmdUpdate(Command):
         ply = self.caller
 
         obj_type = self.word(1)
-        valid_objs = ("accounts", "rooms", "characters", "environments", "zones", "areas", "species")
+        valid_objs = ("accounts", "rooms", "characters", "environments", "zones", "areas", "species", "abilities")
 
         if not obj_type:
             ply.error_echo("You must specify a Python class to update. Valid classes are:")
@@ -95,8 +99,19 @@ class CmdUpdate(Command):
             for o in Area.objects.all():
                 o.update()
         elif obj_type == "species":
-            for o in Species.objects.all():
+            for o in all_species():
+                o.update()
+        elif obj_type == "abilities":
+            # Picks up changes to the ability modules, too.
+            rebuild_abilities()
+            for o in all_abilities():
                 o.update()
+
+            # Tiers may grant different commands now.
+            for session in SESSION_HANDLER.get_sessions():
+                puppet = session.get_puppet()
+                if puppet:
+                    puppet.refresh_ability_cmdset()
         else:
             ply.error_echo("You must specify a Python class to update. Valid classes are:")
             for o in valid_objs:
@@ -158,25 +173,10 @@ class CmdSpeciesChange(Command):
 
     def func(self):
         ply = self.caller
-        species = self.word(1).lower()
-        if species == "human":
-            ply.db.species = Human()
-            ply.echo("Species changed to Human.")
-        elif species == "carven":
-            ply.db.species = Carven()
-            ply.echo("Species changed to Carven.")
-        elif species == "sacrilite":
-            ply.db.species = Sacrilite()
-            ply.echo("Species changed to Sacrilite.")
-        elif species == "luum":
-            ply.db.species = Luum()
-            ply.echo("Species changed to Luum.")
-        elif species == "idol":
-            ply.db.species = Idol()
-            ply.echo("Species changed to Idol.")
-        elif species == "blackbird":
-            ply.db.species = Blackbird()
-            ply.echo("Species changed to Blackbird.")
+        species = get_species(self.word(1))
+        if species:
+            ply.db.species = species.key
+            ply.echo(f"Species changed to {species.name}.")
         else:
             ply.error_echo("That is not a valid species name.")
 
@@ -191,7 +191,7 @@ class CmdSetHp(Command):
             ply.error_echo("Use a number, ding-dong.")
             return
 
-        ply.db.hp["current"] = int(hp)
+        ply.stats.set("hp", int(hp))
         ply.echo(f"You set your HP to |G{hp}|n.")
 
 class CmdPronounChange(Command):
@@ -325,7 +325,7 @@ class CmdDelete(Command):
             tar.delete()
             return
 
-        tar.location = ply.search(settings.DELETION_ROOM, global_search = True)
+        tar.move_to(ply.search(settings.DELETION_ROOM, global_search = True), quiet = True, move_hooks = False)
         self.echo(f"You send {tar.name} (#{tar.id}) to deletion for processing.")
 
 class CmdInflect(Command):
@@ -364,4 +364,42 @@ class CmdAdminHide(Command):
             ply.echo("You go totally invisible.")
         else:
             ply.db.visibility = vis.NORMAL
-            ply.echo("You emerge from your total invisibility.")
\ No newline at end of file
+            ply.echo("You emerge from your total invisibility.")
+
+class CmdTimings(Command):
+    """
+    Review how long the game's hot paths (movement, world ticks, etc.) have been taking.
+
+    |xUsage:|n
+      |Rtimings|n
+      |Rtimings reset|n
+    """
+    key = "timings"
+    aliases = ["timing"]
+    locks = "perm(Developer)"
+    help_category = "Admin"
+
+    def func(self):
+        ply = self.caller
+
+        if self.word(1) == "reset":
+            reset()
+            ply.echo("All timing samples have been cleared.")
+            return
+
+        keys = timing_keys()
+        if not keys:
+            ply.echo("No timings have been recorded yet.")
+            return
+
+        string = header("Timings")
+        string += "\n  |x%s %s %s %s %s|n" % (jleft("KEY", 24), jright("SAMPLES", 8), jright("AVG MS", 10), jright("MAX MS", 10), jright("LAST MS", 10))
+        for key in keys:
+            count, avg, peak, last = summary(key)
+            string += "\n  %s %s %s %s %s" % (jleft(key, 24), jright(count, 8), jright(f"{avg * 1000:.2f}", 10), jright(f"{peak * 1000:.2f}", 10), jright(f"{last * 1000:.2f}", 10))
+
+        if summary(tick.TIMING_KEY):
+            string += "\n\n  Last world tick: |W%d|n zones, |W%d|n objects in |W%d|n slices." % (tick.last_tick["zones"], tick.last_tick["objects"], tick.last_tick["slices"])
+
+        string += "\n" + divider()
+        ply.echo(string)
\ No newline at end of file
@@ -40,6 +40,6 @@ class CmdBody(Command):
         ply = self.caller
         ply.echo("You take a moment to appraise your own body.")
 
-        for i in ply.db.body:
+        for i in range(len(ply.body_layout().parts)):
             desc = ply.bodypart_desc(i).replace("\n", "")
             ply.echo(f"\n|x{jright(i, 4)}|n {jleft(ply.bodypart_name(i), 16)} |x{truncate(desc, 52)}|n")
\ No newline at end of file
@@ -231,5 +231,5 @@ class CmdDrop(Command):
             ply.error_echo("You aren't carrying that on your person.")
             return
 
-        obj.location = ply.location
+        obj.move_to(ply.location, quiet = True)
         ply.message(self_m = f"You drop {obj.name}.", witness_m = f"PLAYER !drop {obj.name}.", prompt = False)
\ No newline at end of file
@@ -1,4 +1,66 @@
+# Blackbirds modules.
 from commands.command import Command
+from world.map import Map, draw_zone
+
+# Largest map a player can ask for. Builders can draw any size.
+MAX_PLAYER_MAP = 19
 
 class CmdMap(Command):
-    pass
\ No newline at end of file
+    """
+    Displays a map of your surroundings.
+
+    |xUsage:|n
+      |Rmap|n
+      |Rmap <width> [height]|n
+      |Rmap zone [z level|all]|n
+
+    Viewing a whole zone is for builders only.
+    """
+    key = "map"
+    help_category = "General"
+
+    def func(self):
+        ply = self.caller
+        builder = ply.account and ply.account.check_permstring("Builder")
+
+        if self.word(1).lower() == "zone":
+            if not builder:
+                ply.error_echo("You don't have permission to view entire zones.")
+                return
+
+            zone = ply.zone()
+            if not zone:
+                ply.error_echo("You aren't in a zone.")
+                return
+
+            level = self.word(2).lower()
+            if not level:
+                z_levels = [ply.z()]
+            elif level == "all":
+                z_levels = None
+            elif level.lstrip("-").isnumeric():
+                z_levels = [int(level)]
+            else:
+                ply.error_echo("Usage: map zone [z level|all]")
+                return
+
+            string = draw_zone(ply, zone, z_levels)
+            if not string:
+                ply.error_echo("There are no rooms to draw there.")
+                return
+
+            ply.echo(string)
+            return
+
+        width = self.word(1) or "9"
+        height = self.word(2) or width
+        if not width.isnumeric() or not height.isnumeric():
+            ply.error_echo("Usage: map <width> [height]")
+            return
+
+        width, height = int(width), int(height)
+        if not builder:
+            width = min(width, MAX_PLAYER_MAP)
+            height = min(height, MAX_PLAYER_MAP)
+
+        ply.echo(Map(ply, width, height).draw_map())
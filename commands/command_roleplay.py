@@ -1,4 +1,5 @@
 from commands.command import Command
+from utilities.emotes import compile_emote
 from utilities.room import room_characters
 from utilities.string import autoformat
 
@@ -46,7 +47,6 @@ class CmdEmote(Command):
     def func(self):
         ply = self.caller
         em_msg = self.args
-        speech_mode = False # Toggle var to detect whether or not we're in the midst of speech.
 
         # Player supplied a blank emote.
         if not em_msg:
@@ -72,32 +72,23 @@ class CmdEmote(Command):
         # Pass entire emote through formatter to auto-capitalize and punctuate.
         em_msg = autoformat(em_msg)
 
-        # Speech detection:
-        if '"' in em_msg:
-            new_em_msg = []
-            temp = em_msg.split('"')
-            for segment in temp:
-                if speech_mode:
-                    new_em_msg.append('|C"%s"|n' % segment)
-                else:
-                    new_em_msg.append(segment)
-                speech_mode = not speech_mode
-
-            em_msg = ''.join(new_em_msg)
+        # Parse speech and @tokens once; everyone in the room gets their own rendering.
+        emote = compile_emote(em_msg, ply.location.characters)
 
         # Give out XP/Rubric, if applicable.
-        self.grant_rewards(em_msg)
+        self.grant_rewards(emote)
 
         # Send the message out!
         ply.echo("|xYou emote:|n")
-        ply.location.echo(em_msg, type = "emote", origin = ply, prompt = True)
+        ply.location.echo(emote, type = "emote", origin = ply, prompt = True)
 
-    def grant_rewards(self, msg):
+    def grant_rewards(self, emote):
         ply = self.caller
         room = ply.location
         ply_list = room_characters(room)
         ply_count = len(ply_list)
         ply_targets = 0
+        msg = emote.text
 
         if len(msg) < 16:
             return
@@ -116,6 +107,6 @@ class CmdEmote(Command):
         # Rubric is fixed currently at 1% of XP gain.
         new_rb = new_xp * 0.01
 
-        ply.db.xp["current"] += new_xp
+        ply.stats.add("xp", new_xp)
         ply.account.db.rubric += new_rb
         ply.echo(f"|yYour emote generated {new_xp} experience and {new_rb} Rubric.|n")
\ No newline at end of file
@@ -8,9 +8,10 @@ from typeclasses.environments import Environment
 from typeclasses.zones import Zone
 from utilities.directions import valid_direction, coord_shift
 from utilities.display import header, divider
-from utilities.room import get_room, get_room_id, sanitize_roomname, inc_roomname, roomname_exists
+from utilities.room import get_room, get_room_id, sanitize_roomname, inc_roomname, roomname_exists, cache_room
 from utilities.string import jleft, jright
 import utilities.directions as dirs
+from world import spatial
 
 VALID_ROOM_VALUES = ("temperature", "illumination", "water_level")
 VALID_ROOM_FLAGS = ("indoors", "darkness", "natural", "public", "shop", "house", "battleground", "craft_hall", "chapel", "bank", "insulated", "hidden")
@@ -128,6 +129,7 @@ def room_create(ply, dir = None):
         dir_append = f", {dir} from your current location"
 
     new_room.db.x, new_room.db.y, new_room.db.z = r_x, r_y, r_z
+    spatial.index_room(new_room)
 
     ply.echo(f"You created a new room, {r_name}{dir_append} ({new_room.coordinates}).")
 
@@ -144,6 +146,7 @@ def room_shortname(ply, tar_room = None, new_name = None):
         return
 
     tar_room.name = new_name
+    cache_room(tar_room)
     ply.echo(f"You change the ID of the current room from |x{previous_name}|n to |x{new_name}|n.")
 
 def room_rename(ply, tar_room = None, new_name = None):
@@ -182,6 +185,7 @@ def room_environment(ply, tar_room = None, new_env = None):
         return
 
     tar_room.db.environment = env
+    spatial.touch_room(tar_room)
 
     r_id = tar_room.id
     r_name = tar_room.name
@@ -244,6 +248,7 @@ def room_shift(ply, tar_room = None, dir = None):
     tar_room.db.x += r_x
     tar_room.db.y += r_y
     tar_room.db.z += r_z
+    spatial.index_room(tar_room)
     ply.echo(f"You shift the room to the {dir} ({tar_room.coordinates}).")
 
 def room_zone(ply, tar_room = None, zone = None):
@@ -317,6 +322,10 @@ def room_flag(ply, tar_room = None, flag_name = None, flag = None):
     elif flag == "false":
         setattr(tar_room.db, flag_name, False)
 
+    if flag_name == "hidden":
+        # Hidden rooms drop off of every map that links to them, not just their own zone's.
+        spatial.touch_world()
+
     ply.echo(f"You set {tar_room.name}'s {flag_name} to {str(getattr(tar_room.db, flag_name))}.")
 
 class CmdRoom(Command):
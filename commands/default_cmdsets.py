@@ -19,7 +19,7 @@ from evennia import default_cmds, CmdSet
 from commands.command_roleplay import CmdEmote
 from commands.command_general import CmdLook, CmdSay, CmdSit, CmdStand, CmdLie, CmdWho, CmdColors, CmdDrop
 from commands.command_character import CmdDescribe, CmdScore, CmdBody
-from commands.command_admin import CmdReload, CmdUpdate, CmdList, CmdTest, CmdSpeciesChange, CmdSetHp, CmdPronounChange, CmdGoto, CmdRelocate, CmdDelete, CmdInflect, CmdAdminHide
+from commands.command_admin import CmdReload, CmdUpdate, CmdList, CmdTest, CmdSpeciesChange, CmdSetHp, CmdPronounChange, CmdGoto, CmdRelocate, CmdDelete, CmdInflect, CmdAdminHide, CmdTimings
 from commands.command_room import CmdRoom
 from commands.command_ability import CmdAbilities
 from commands.command_environment import CmdEnvironment, CmdEnvironments
@@ -34,6 +34,10 @@ from commands.command_combat_basic import CmdPunch
 from commands.command_admin_creation import CmdCreate, CmdCreation
 
 
+# Commands granted by abilities, by the name used in the ability's "cmd:" tier entries. Names
+# without a Command here haven't been implemented yet, and are skipped.
+ABILITY_COMMANDS = {}
+
 class CharacterCmdSet(default_cmds.CharacterCmdSet):
     """
     The `CharacterCmdSet` contains general in-game commands like `look`,
@@ -98,6 +102,23 @@ class CharacterCmdSet(default_cmds.CharacterCmdSet):
         self.add(CmdCreate())
         self.add(CmdCreation())
         self.add(CmdDrop())
+        self.add(CmdTimings())
+
+class AbilityCmdSet(CmdSet):
+    """
+    The commands a character's abilities and ability trees have unlocked, merged on
+    top of the CharacterCmdSet. Built from the names the character has worked out
+    (see Character.refresh_ability_cmdset), and only rebuilt when those change.
+    """
+    key = "Abilities"
+
+    def at_cmdset_creation(self):
+        obj = self.cmdsetobj
+        unlocked = obj.ndb.ability_commands if obj else None
+        for name in sorted(unlocked or ()):
+            cmd = ABILITY_COMMANDS.get(name)
+            if cmd:
+                self.add(cmd())
 
 class AdminCmdSet(default_cmds.CharacterCmdSet):
     key = "DefaultAdmin"
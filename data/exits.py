@@ -0,0 +1,11 @@
+# Exit flags, packed into a single bitmask per direction.
+VISIBLE = 1
+DOOR = 2
+LOCKED = 4
+ACCESSIBLE = 8
+
+# Flags given to every freshly reset exit slot.
+DEFAULT = VISIBLE | ACCESSIBLE
+
+# Destination id for an empty exit slot.
+NO_EXIT = 0
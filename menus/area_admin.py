@@ -2,6 +2,7 @@ from evennia import create_object
 
 from typeclasses.areas import Area
 from utilities.string import jleft, jright, sanitize
+from world import spatial
 
 def _delete_area(caller, raw_string, **kwargs):
     area = caller.search("#" + raw_string, global_search = True)
@@ -27,6 +28,7 @@ def _edit_area_parse_input(caller, raw_string, **kwargs):
 
         new_name = input_list[1]
         area.name = new_name
+        spatial.touch_world()
 
     elif input_list[0] == "fullname":
         if len(input_list) <= 1:
@@ -35,6 +37,7 @@ def _edit_area_parse_input(caller, raw_string, **kwargs):
 
         new_fullname = " ".join(input_list[1:])
         area.db.fullname = new_fullname
+        spatial.touch_world()
 
     elif input_list[0] == "city":
         area.db.is_city = not area.db.is_city
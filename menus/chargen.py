@@ -3,7 +3,7 @@ import re, string
 
 # Blackbirds modules.
 from server.conf import settings
-from typeclasses.species import Human, Carven, Sacrilite, Luum, Idol, Blackbird
+from typeclasses.species import get_species
 from utilities.characters import name_is_taken
 from utilities.display import bullet
 from utilities.number import cm_to_ft
@@ -15,9 +15,9 @@ _SPAWN_ROOM = settings.SPAWN_LOCATION
 def identity_validate(caller):
     # Check the player's name, age, etc. and make sure it's all appropriate for
     # their chosen species.
-    valid, err_msg = name_validate(caller.name, caller.name, unusual_names = caller.db.species.unusual_names, check_duplicates = False)
+    valid, err_msg = name_validate(caller.name, caller.name, unusual_names = caller.species_data.unusual_names, check_duplicates = False)
     if valid == False:
-        caller.echo(f"|RThe name you have selected is not appropriate for {an(caller.db.species.name)}.|n")
+        caller.echo(f"|RThe name you have selected is not appropriate for {an(caller.species_data.name)}.|n")
         caller.echo(f"|Y{err_msg}|n")
         return "chargen_identity"
 
@@ -69,7 +69,7 @@ def name_validate(new_name, old_name, unusual_names = False, check_duplicates =
 def name_selection(caller, new_name = None, no_args = False):
     if no_args:
         caller.echo("|RYou must specify a name. This can be from 3 to 24 characters.|n")
-        if caller.db.species.unusual_names:
+        if caller.species_data.unusual_names:
             caller.echo("\n |c-|n You may use letters, numbers, dashes, periods, or apostrophes.")
             caller.echo("\n |c-|n Your name must start with a letter.")
             caller.echo("\n |c-|n You do not have to capitalize the first letter of your name.")
@@ -83,12 +83,12 @@ def name_selection(caller, new_name = None, no_args = False):
     new_name = new_name.strip()
 
 
-    valid, err_msg = name_validate(new_name, caller.name, unusual_names = caller.db.species.unusual_names)
+    valid, err_msg = name_validate(new_name, caller.name, unusual_names = caller.species_data.unusual_names)
     if valid == False:
         caller.echo(f"|R{err_msg}|n")
         return
 
-    if caller.db.species.unusual_names == False:
+    if caller.species_data.unusual_names == False:
         # Python's built-in capitalize() forces the rest of the string to be lowercase.
         new_name = new_name.capitalize()
 
@@ -100,7 +100,7 @@ def name_selection(caller, new_name = None, no_args = False):
 def surname_selection(caller, new_name = None, no_args = False):
     if no_args:
         caller.echo("|RYou must specify a surname. This can be from 3 to 24 characters.|n")
-        if caller.db.species.unusual_names:
+        if caller.species_data.unusual_names:
             caller.echo("\n |c-|n You may use letters, numbers, dashes, periods, or apostrophes.")
             caller.echo("\n |c-|n Your surname must start with a letter.")
             caller.echo("\n |c-|n You do not have to capitalize the first letter of your surname.")
@@ -108,7 +108,7 @@ def surname_selection(caller, new_name = None, no_args = False):
             caller.echo("\n |c-|n You may only use letters.")
             caller.echo("\n |c-|n Your surname will be automatically capitalized, with the rest converted to")
             caller.echo("\n   lowercase.")
-        if not caller.db.species.requires_surname:
+        if not caller.species_data.requires_surname:
             caller.echo("\n\n |c-|n You may opt not to have a surname by entering |Rsurname clear|n.")
         caller.echo("\n")
         return
@@ -116,12 +116,12 @@ def surname_selection(caller, new_name = None, no_args = False):
     new_name = new_name.strip()
 
 
-    valid, err_msg = name_validate(new_name, caller.name, unusual_names = caller.db.species.unusual_names)
+    valid, err_msg = name_validate(new_name, caller.name, unusual_names = caller.species_data.unusual_names)
     if valid == False:
         caller.echo(f"|R{err_msg}|n")
         return
 
-    if caller.db.species.unusual_names == False:
+    if caller.species_data.unusual_names == False:
         new_name = capital(new_name) # We won't lowercase in the event of names like McGee
 
     if new_name.lower() == "clear":
@@ -130,8 +130,8 @@ def surname_selection(caller, new_name = None, no_args = False):
         caller.db.surname = new_name
 
 def age_selection(caller, new_age = None):
-    min_age = caller.db.species.min_age
-    max_age = caller.db.species.max_age
+    min_age = caller.species_data.min_age
+    max_age = caller.species_data.max_age
 
     if not new_age:
         caller.echo(f"|RYou must specify an age. For your species, this can be anywhere from {min_age} to {max_age}.\n")
@@ -153,29 +153,9 @@ def age_selection(caller, new_age = None):
     caller.db.age = new_age
 
 def _init_halfbreed(caller, species):
-    # Reinitialize player's Human species.
-    caller.db.species = Human()
-
-    if species == "Carven":
-        caller.db.halfbreed_family = "Carven"
-        caller.db.species.has_horns = True
-        caller.db.species.horns_optional = True
-
-    elif species == "Sacrilite":
-        caller.db.halfbreed_family = "Sacrilite"
-        caller.db.species.has_fangs = True
-        caller.db.species.fang_choice = True
-        caller.db.species.fangs_optional = True
-        caller.db.species.has_tail = True
-        caller.db.species.tail_optional = True
-
-    elif species == "Luum":
-        caller.db.halfbreed_family = "Luum"
-        caller.db.species.has_fangs = True
-        caller.db.species.fangs_optional = True
-        caller.db.species.has_bioluminescence = True
-        caller.db.species.bioluminescence_optional = True
-        caller.db.species.can_eat_anything = True
+    # Half-breeds are Humans; the traits from the other side of the family come with the family (see HALFBREED_TRAITS).
+    caller.db.species = "human"
+    caller.db.halfbreed_family = species
 
 def anatomy_selection(caller, **kwargs):
     anatomy = kwargs.get("anatomy")
@@ -185,7 +165,7 @@ def anatomy_selection(caller, **kwargs):
     elif anatomy == "halfbreed":
         caller.db.is_halfbreed = not caller.db.is_halfbreed
         if caller.db.is_halfbreed == False:
-            caller.db.species = Human()
+            caller.db.species = "human"
         else:
             _init_halfbreed(caller, "Carven")
     elif anatomy == "halfbreed_family":
@@ -234,17 +214,17 @@ def _chargen_base_species_info(caller, raw_string, **kwargs):
 
     species = None
     if input_string == "human" or input_string == "humans":
-        species = Human()
+        species = get_species("human")
     elif input_string == "carven" or input_string == "carvens":
-        species = Carven()
+        species = get_species("carven")
     elif input_string == "sacrilite" or input_string == "sacrilites":
-        species = Sacrilite()
+        species = get_species("sacrilite")
     elif input_string == "luum" or input_string == "luums" or input_string == "loom" or input_string == "looms":
-        species = Luum()
+        species = get_species("luum")
     elif input_string == "idol" or input_string == "idols":
-        species = Idol()
+        species = get_species("idol")
     elif input_string == "blackbird" or input_string == "blackbirds" and caller.check_permstring("Admin"):
-        species = Blackbird()
+        species = get_species("blackbird")
 
     if species:
         # Basic information.
@@ -306,27 +286,27 @@ def _chargen_select_species(caller, raw_string, **kwargs):
     caller._reset_species_flags()
 
     if species == "Human":
-        caller.db.species = Human()
+        caller.db.species = "human"
     elif species == "Carven":
-        caller.db.species = Carven()
+        caller.db.species = "carven"
         caller.db.has_horns = True
     elif species == "Sacrilite":
-        caller.db.species = Sacrilite()
+        caller.db.species = "sacrilite"
         caller.db.has_fangs = True
         caller.db.has_tail = True
     elif species == "Luum":
-        caller.db.species = Luum()
+        caller.db.species = "luum"
         caller.db.has_bioluminescence = True
     elif species == "Idol":
         if caller.check_permstring("Developer"):
-            caller.db.species = Idol()
+            caller.db.species = "idol"
         else:
             # caller.error_echo("The Idol species will be available to you upon purchasing it with Rubric. Please make another selection.")
             caller.error_echo("The Idol species is unfinished, and currently unavailable. Please make another selection.")
             return "chargen_base"
     elif species == "Blackbird":
         if caller.check_permstring("Admin"):
-            caller.db.species = Blackbird()
+            caller.db.species = "blackbird"
 
     return "chargen_identity"
 
@@ -388,37 +368,37 @@ def chargen_pronoun_menu(caller, raw_string, **kwargs):
     return text, options
 
 def chargen_anatomy(caller, raw_string, **kwargs):
-    text = f"Here, you'll specify certain aspects of your character's anatomy. Your choices here are dependent on your character's species, and can affect various game mechanics, from the names of clothing slots, to ability use, to the ability to bear children. Please take care in selecting these, as none of these choices are easily altered.\n\nAs {an(caller.db.species.name)}, {caller.name}..."
+    text = f"Here, you'll specify certain aspects of your character's anatomy. Your choices here are dependent on your character's species, and can affect various game mechanics, from the names of clothing slots, to ability use, to the ability to bear children. Please take care in selecting these, as none of these choices are easily altered.\n\nAs {an(caller.species_data.name)}, {caller.name}..."
 
     options = []
 
-    if caller.db.species.can_halfbreed:
+    if caller.species_data.can_halfbreed:
         options.append({"desc": anatomy_display("is a halfbreed.", caller.db.is_halfbreed), "goto": (anatomy_selection, {"anatomy": "halfbreed"})})
 
-    if caller.db.species.can_halfbreed and caller.db.is_halfbreed:
+    if caller.species_data.can_halfbreed and caller.db.is_halfbreed:
         options.append({"desc": anatomy_display(f"halfbreed family: |W{caller.db.halfbreed_family}|n.", None, bool = False), "goto": (anatomy_selection, {"anatomy": "halfbreed_family"})})
 
     options.append({"desc": anatomy_display("has breasts.", caller.db.has_breasts), "goto": (anatomy_selection, {"anatomy": "breasts"})})
 
-    if caller.db.species.can_reproduce:
+    if caller.species_data.can_reproduce:
         options.append({"desc": anatomy_display("can become pregnant.", caller.db.can_carry_child), "goto": (anatomy_selection, {"anatomy": "pregnancy"})})
 
-    if caller.db.species.can_be_fourarmed:
+    if caller.species_data.can_be_fourarmed:
         options.append({"desc": anatomy_display("has four arms.", caller.db.has_four_arms), "goto": (anatomy_selection, {"anatomy": "four_arms"})})
 
-    if caller.db.species.has_horns and caller.db.species.horns_optional:
+    if caller.species_data.has_horns and caller.species_data.horns_optional:
         options.append({"desc": anatomy_display("has horns.", caller.db.has_horns), "goto": (anatomy_selection, {"anatomy": "horns"})})
 
-    if caller.db.species.has_fangs and caller.db.species.fangs_optional:
+    if caller.species_data.has_fangs and caller.species_data.fangs_optional:
         options.append({"desc": anatomy_display("has fangs.", caller.db.has_fangs), "goto": (anatomy_selection, {"anatomy": "fangs_toggle"})})
 
-    if caller.db.has_fangs and caller.db.species.fang_choice:
+    if caller.db.has_fangs and caller.species_data.fang_choice:
         options.append({"desc": anatomy_display(f"fang style: |W{caller.db.fang_desc}|n.", None, bool = False), "goto": (anatomy_selection, {"anatomy": "fangs_style"})})
 
-    if caller.db.species.has_tail and caller.db.species.tail_optional:
+    if caller.species_data.has_tail and caller.species_data.tail_optional:
         options.append({"desc": anatomy_display("has a tail.", caller.db.has_tail), "goto": (anatomy_selection, {"anatomy": "tail"})})
 
-    if caller.db.species.has_bioluminescence and caller.db.species.bioluminescence_optional:
+    if caller.species_data.has_bioluminescence and caller.species_data.bioluminescence_optional:
         options.append({"desc": anatomy_display("has bioluminescence.", caller.db.has_bioluminescence), "goto": (anatomy_selection, {"anatomy": "bioluminescence_toggle"})})
 
     if caller.db.has_bioluminescence:
@@ -4,6 +4,7 @@ from evennia import create_object
 
 from typeclasses.environments import Environment
 from utilities.string import jleft, jright, sanitize
+from world import spatial
 
 def _delete_environment(caller, raw_string, **kwargs):
     env = caller.search("#" + raw_string, global_search = True)
@@ -41,6 +42,7 @@ def _edit_environment_parse_input(caller, raw_string, **kwargs):
 
         new_short = input_list[1]
         env.db.short = new_short.lower()
+        spatial.touch_world()
 
     elif input_list[0] == "color":
         if len(input_list) <= 1:
@@ -58,6 +60,7 @@ def _edit_environment_parse_input(caller, raw_string, **kwargs):
             return "node_edit_selected_environment", {"selected_env": caller.ndb._menutree.selected_env}
 
         env.db.color = new_color
+        spatial.touch_world()
 
     elif input_list[0] == "natural":
         env.db.natural = not env.db.natural
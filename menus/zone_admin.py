@@ -3,6 +3,7 @@ from evennia import create_object
 from typeclasses.areas import area_list
 from typeclasses.zones import Zone
 from utilities.string import jleft, jright, sanitize
+from world import spatial
 
 def _delete_zone(caller, raw_string, **kwargs):
     zone = caller.search("#" + raw_string, global_search = True)
@@ -43,6 +44,7 @@ def _edit_zone_parse_input(caller, raw_string, **kwargs):
 
         new_fullname = " ".join(input_list[1:])
         zone.db.fullname = new_fullname
+        spatial.touch_zone(zone)
 
     elif input_list[0] == "area":
         caller.error_echo("Not yet implemented.")
@@ -15,6 +15,10 @@ at_server_cold_start()
 at_server_cold_stop()
 
 """
+# Blackbirds modules.
+from utilities import abilities, grammar, scheduler
+from typeclasses import stats, zones
+from world import clock, tick
 
 
 def at_server_start():
@@ -22,7 +26,21 @@ def at_server_start():
     This is called every time the server starts up, regardless of
     how it was shut down.
     """
-    pass
+    # Conjugate the message templates' verbs now, rather than mid-combat.
+    grammar.warm_up()
+
+    # Index every ability once, up front.
+    abilities.build()
+
+    # Pick balance and other timers back up where they left off.
+    scheduler.restore()
+
+    # Make sure the world tick is running.
+    tick.start()
+
+    # Sunrise and sunset echoes.
+    clock.subscribe(zones.announce_phase)
+    clock.start()
 
 
 def at_server_stop():
@@ -30,7 +48,10 @@ def at_server_stop():
     This is called just before the server is shut down, regardless
     of it is for a reload, reset or shutdown.
     """
-    pass
+    scheduler.save()
+
+    # Write out any stat changes still waiting on the flush timer.
+    stats.flush_all()
 
 
 def at_server_reload_start():
@@ -6,6 +6,7 @@ class Ability():
     def __init__(self):
         self.key = "UndefinedAbility"
         self.name = "Undefined Ability"
+        self.aliases = []
         self._can_train = True
         self._costs_rubric = False
         self._levels = 10
@@ -36,4 +37,30 @@ class Ability():
 
     def get_cost(self):
         "Returns the base cost of the ability in experience."
-        return self._cost
\ No newline at end of file
+        return self._cost
+
+class AbilityTree():
+    """
+    A group of abilities. A tree's level is the total level of its member abilities,
+    capped at max_level, and isn't trained directly. Hidden trees only show once
+    their requirements (ability and tree levels, by key) are met.
+    """
+    def __init__(self):
+        self.key = "UndefinedTree"
+        self.name = "Undefined Tree"
+        self.members = ()
+        self.hidden = False
+        self.requirements = {"abilities": {}, "trees": {}}
+        self._levels = 9
+        self._description = "An undefined ability tree."
+        self.tiers = {}
+
+    def update(self):
+        pass
+
+    def max_level(self):
+        "Get the highest level the tree can reach. Abilities in a full tree can't be trained further."
+        return self._levels
+
+    def description(self):
+        return self._description
@@ -0,0 +1,34 @@
+# Evennia modules.
+from evennia.typeclasses.attributes import AttributeHandler
+
+class VersionedAttributeHandler(AttributeHandler):
+    """
+    An AttributeHandler that tells its object whenever one of its attributes is
+    written or removed, by calling obj.at_attribute_change(key).
+
+    Every self.db.foo = bar goes through here, which lets typeclasses keep caches of
+    things rendered from their attributes. Note that mutating a stored list or dict in
+    place (self.db.foo["bar"] = 1) saves the attribute directly and does NOT come
+    through the handler - objects that do that need to invalidate by hand.
+    """
+    def _changed(self, key):
+        hook = getattr(self.obj, "at_attribute_change", None)
+        if hook:
+            hook(key)
+
+    def add(self, key, *args, **kwargs):
+        super().add(key, *args, **kwargs)
+        self._changed(key)
+
+    def batch_add(self, *args, **kwargs):
+        super().batch_add(*args, **kwargs)
+        for attr in args:
+            self._changed(attr[0])
+
+    def remove(self, key = None, *args, **kwargs):
+        super().remove(key, *args, **kwargs)
+        self._changed(key)
+
+    def clear(self, *args, **kwargs):
+        super().clear(*args, **kwargs)
+        self._changed(None)
@@ -0,0 +1,111 @@
+"""
+Body parts.
+
+What a body is made of depends only on a handful of anatomy flags (has_horns,
+has_tail and so on), so the part definitions are built once per combination of
+flags and shared by every character with that anatomy. Each layout comes with an
+index of every name a part answers to, key, plural and aliases alike.
+
+What does differ from person to person - descriptions, injuries, coverage - is
+kept on the character in db.body, keyed by part key, and only for fields that
+differ from OVERLAY_DEFAULTS.
+"""
+# Python modules.
+from functools import lru_cache
+
+# Character attributes the body layout is built from.
+ANATOMY_ATTRIBUTES = ("has_breasts", "has_horns", "has_four_arms", "has_tail", "has_bioluminescence")
+
+# Per-character body part fields, and their values when they've not been set.
+OVERLAY_DEFAULTS = {
+    "desc": "", # The player's customized description for this part.
+    "is_missing": False, # Is the body part omitted from the player?
+    "is_covered": False, # Is it covered by clothing or otherwise hidden?
+    "is_prosthetic": False, # Does the player have a mechanical/false version?
+    "injury_level": 0, # How injured is it? [0 - 3]
+}
+
+class BodyPart():
+    "A body part definition. Shared between characters - do not modify."
+    __slots__ = ("key", "aliases", "fullname", "plural_name", "can_be_missing", "is_optional", "is_abstract", "is_inappropriate", "is_heavy", "can_be_injured")
+
+    def __init__(self, key, aliases = (), fullname = "", plural_name = "", can_be_missing = True, is_optional = False, is_abstract = False, is_inappropriate = False, is_heavy = False, can_be_injured = True):
+        self.key = key
+        self.aliases = tuple(aliases)
+        self.fullname = fullname if fullname else key
+        if plural_name:
+            self.plural_name = plural_name
+        else:
+            self.plural_name = f"{self.fullname}{'s' if self.fullname[-1:] != 's' else ''}"
+        self.can_be_missing = can_be_missing # If False, ignores all aspects of missing messages/mechanics.
+        self.is_optional = is_optional # If true, the part will not be reported if missing.
+        self.is_abstract = is_abstract # Used for the 'general' body part, so you can't put clothes on it somehow.
+        self.is_inappropriate = is_inappropriate # Will NPCs freak out if the player walks around with it exposed?
+        self.is_heavy = is_heavy # For 3rd/4th arms, tank treads, etc. Imposes balance penalties.
+        self.can_be_injured = can_be_injured # Self-explanatory. False for things like hair, etc.
+
+class BodyLayout():
+    "The parts of a body, in order, with every name they go by."
+    __slots__ = ("parts", "index")
+
+    def __init__(self, parts):
+        self.parts = tuple(parts)
+        self.index = {}
+        for part in self.parts:
+            self.index[part.key] = part
+            self.index[part.plural_name] = part
+            for alias in part.aliases:
+                self.index[alias] = part
+
+    def find(self, name):
+        "Returns the part going by the name (or at that position in the body), or None."
+        if isinstance(name, int):
+            return self.parts[name] if 0 <= name < len(self.parts) else None
+
+        return self.index.get(name)
+
+@lru_cache(maxsize = None)
+def body_layout(has_breasts = True, has_horns = False, has_four_arms = False, has_tail = False, has_bioluminescence = False):
+    "Returns the shared BodyLayout for the given anatomy."
+    parts = []
+    parts.append(BodyPart("general", aliases = ["self", "base", "basic"], plural_name = "general", can_be_missing = False, can_be_injured = False, is_abstract = True))
+    parts.append(BodyPart("hair", plural_name = "hair", can_be_missing = False, can_be_injured = False))
+    if has_horns:
+        parts.append(BodyPart("horns", aliases = ["horn"], plural_name = "horns"))
+    parts.append(BodyPart("eye"))
+    parts.append(BodyPart("face", can_be_missing = False))
+    parts.append(BodyPart("neck", aliases = ["throat"], can_be_missing = False))
+    if has_breasts:
+        parts.append(BodyPart("breasts", aliases = ["breast"], plural_name = "breasts", can_be_missing = False))
+    else:
+        parts.append(BodyPart("chest", aliases = ["breast"], can_be_missing = False))
+    parts.append(BodyPart("nipples", aliases = ["nip", "nips"], plural_name = "nipples", can_be_injured = False))
+    parts.append(BodyPart("stomach", aliases = ["tummy", "belly", "gut", "stummy"], can_be_missing = False))
+    parts.append(BodyPart("upper_back", fullname = "upper back", aliases = ["ub"], can_be_missing = False))
+    parts.append(BodyPart("lower_back", fullname = "lower back", aliases = ["lb"], can_be_missing = False))
+    parts.append(BodyPart("upper_arms", fullname = "upper arms", aliases = ["ua", "upperarms"]))
+    parts.append(BodyPart("lower_arms", fullname = "lower arms", aliases = ["la", "lowerarms"]))
+    if has_four_arms:
+        parts.append(BodyPart("extra_arms", fullname = "extra arms", aliases = ["ea", "extraarms"], is_heavy = True))
+    parts.append(BodyPart("hands"))
+    if has_tail:
+        parts.append(BodyPart("tail"))
+    parts.append(BodyPart("genitals", aliases = ["groin", "loins", "penis", "vagina", "cock", "dick", "pussy"], plural_name = "genitalia", is_inappropriate = True))
+    parts.append(BodyPart("buttocks", aliases = ["butt", "booty", "ass", "derriere"], plural_name = "buttocks", can_be_missing = False))
+    parts.append(BodyPart("upper_leg", fullname = "upper legs", aliases = ["ul"]))
+    parts.append(BodyPart("lower_leg", fullname = "lower legs", aliases = ["ll"]))
+    parts.append(BodyPart("feet"))
+    if has_bioluminescence:
+        parts.append(BodyPart("bioluminescence", aliases = ["bio", "light", "biolight", "luminescence"], plural_name = "bioluminescence", can_be_missing = False, can_be_injured = False, is_abstract = True))
+
+    return BodyLayout(parts)
+
+def convert_body(old_body):
+    "Turns an old db.body ({index: {every field}}) into an overlay ({key: {changed fields}})."
+    overlay = {}
+    for entry in old_body.values():
+        changed = {field: entry[field] for field, default in OVERLAY_DEFAULTS.items() if entry.get(field, default) != default}
+        if changed:
+            overlay[entry["key"]] = changed
+
+    return overlay
@@ -4,18 +4,40 @@ import re, random
 # Evennia modules.
 from evennia import DefaultCharacter
 from evennia import TICKER_HANDLER as tickerhandler
+from evennia.objects.models import ObjectDB
 from evennia.utils import logger
+from evennia.utils.utils import delay, lazy_property
 
 # Blackbirds modules.
 from data import visibility as vis
-from typeclasses.species import Human
+from typeclasses.attributes import VersionedAttributeHandler
+from typeclasses.body import ANATOMY_ATTRIBUTES, OVERLAY_DEFAULTS, body_layout, convert_body
+from typeclasses.species import Species, get_species
+from typeclasses.stats import StatHandler, STATS
 from utilities.color import color_ramp
+from utilities import abilities
 from utilities.communication import process_speech
 from utilities.display import header, divider, column, bullet
-from utilities.string import an, capital, plural, message_token_pluralize, message_token_capitalize, jright, num_word, autoformat
+from utilities.grammar import conjugate
+from utilities.messages import render_message
+from utilities import output
+from utilities.room import get_room
+from utilities import scheduler
+from utilities.string import an, capital, jright, num_word, autoformat
+from utilities.timing import Timer
 import utilities.directions as dirs
+from world import occupancy
 from world.names import CURRENCY, CURRENCY_FULL
 
+# Cmdset holding the commands unlocked by abilities.
+ABILITY_CMDSET = "commands.default_cmdsets.AbilityCmdSet"
+
+# Attributes shown in the prompt. Writing any of them marks the cached prompt as out of date.
+PROMPT_ATTRIBUTES = ("hp", "en", "xp", "sc", "prone", "balance")
+# Attributes that make up how the character looks. Writing any of them (or any anatomy flag) marks the cached appearance as out of date.
+APPEARANCE_ATTRIBUTES = ("body", "species", "is_halfbreed", "halfbreed_family", "height", "age", "desc", "identity", "nicks",
+    "pronoun_they", "pronoun_them", "pronoun_their", "pronoun_theirs")
+
 class Character(DefaultCharacter):
     def at_object_creation(self):
         self.db.surname = ""
@@ -29,7 +51,7 @@ class Character(DefaultCharacter):
         self.db.pronoun_them = "them"
         self.db.pronoun_their = "their"
         self.db.pronoun_theirs = "theirs"
-        self.db.species = Human()
+        self.db.species = "human"
 
         # Stats.
         self.db.hp = {"current": 20, "max": 20} # Hit points.
@@ -74,61 +96,23 @@ class Character(DefaultCharacter):
     def update(self):
         self.db.visibility = vis.NORMAL
 
+        # Balance used to recover through a ticker; clear out any left behind.
+        if self.db.balance_time:
+            tickerhandler.remove(self.db.balance_time, self.recover_balance)
+
+        # Species used to be stored whole on each character.
+        if isinstance(self.db.species, Species):
+            self.db.species = self.db.species.name.lower()
+
+        # Bodies used to store every part's full definition, by position.
+        self.body_table()
+        if self.attributes.has("bodypart_names"):
+            self.attributes.remove("bodypart_names")
+
     def build_body(self):
-        # Goddamn what a mess
+        "Resets the body's descriptions, injuries and so on. Which parts it has follows the anatomy flags."
         self.db.body = {}
-        self.init_bodypart(key = "general", aliases = ["self", "base", "basic"], plural_name = "general", can_be_missing = False, can_be_injured = False, is_abstract = True)
-        self.init_bodypart(key = "hair", plural_name = "hair", can_be_missing = False, can_be_injured = False)
-        if self.db.has_horns:
-            self.init_bodypart(key = "horns", aliases = ["horn"], plural_name = "horns")
-        self.init_bodypart(key = "eye")
-        self.init_bodypart(key = "face", can_be_missing = False)
-        self.init_bodypart(key = "neck", aliases = ["throat"], can_be_missing = False)
-        if self.db.has_breasts:
-            self.init_bodypart(key = "breasts", aliases = ["breast"], plural_name = "breasts", can_be_missing = False)
-        else:
-            self.init_bodypart(key = "chest", aliases = ["breast"], can_be_missing = False)
-        self.init_bodypart(key = "nipples", aliases = ["nip", "nips"], plural_name = "nipples", can_be_injured = False)
-        self.init_bodypart(key = "stomach", aliases = ["tummy", "belly", "gut", "stummy"], can_be_missing = False)
-        self.init_bodypart(key = "upper_back", fullname = "upper back", aliases = ["ub"], can_be_missing = False)
-        self.init_bodypart(key = "lower_back", fullname = "lower back", aliases = ["lb"], can_be_missing = False)
-        self.init_bodypart(key = "upper_arms", fullname = "upper arms", aliases = ["ua", "upperarms"])
-        self.init_bodypart(key = "lower_arms", fullname = "lower arms", aliases = ["la", "lowerarms"])
-        if self.db.has_four_arms:
-            self.init_bodypart(key = "extra_arms", fullname = "extra arms", aliases = ["ea", "extraarms"], is_heavy = True)
-        self.init_bodypart(key = "hands")
-        if self.db.has_tail:
-            self.init_bodypart(key = "tail")
-        self.init_bodypart(key = "genitals", aliases = ["groin", "loins", "penis", "vagina", "cock", "dick", "pussy"], plural_name = "genitalia", is_inappropriate = True)
-        self.init_bodypart(key = "buttocks", aliases = ["butt", "booty", "ass", "derriere"], plural_name = "buttocks", can_be_missing = False)
-        self.init_bodypart(key = "upper_leg", fullname = "upper legs", aliases = ["ul"])
-        self.init_bodypart(key = "lower_leg", fullname = "lower legs", aliases = ["ll"])
-        self.init_bodypart(key = "feet")
-        if self.db.has_bioluminescence:
-            self.init_bodypart(key = "bioluminescence", aliases = ["bio", "light", "biolight", "luminescence"], plural_name = "bioluminescence", can_be_missing = False, can_be_injured = False, is_abstract = True)
-        self.db.bodypart_names = self.build_bodypart_names()
-
-    def init_bodypart(self, key = "body_part", aliases = [], fullname = "", plural_name = "", desc = "", can_be_missing = True, is_missing = False, is_optional = False, is_abstract = False, is_covered = False, is_prosthetic = False, is_inappropriate = False, is_heavy = False, can_be_injured = True, injury_level = 0):
-        i = len(self.db.body)
-        self.db.body[i] = {}
-        self.db.body[i]["key"] = key
-        self.db.body[i]["aliases"] = aliases
-        self.db.body[i]["fullname"] = fullname if fullname else key
-        if plural_name:
-            self.db.body[i]["plural_name"] = plural_name
-        else:
-            self.db.body[i]["plural_name"] = f"{self.db.body[i]['fullname']}{'s' if self.db.body[i]['fullname'][-1:] != 's' else ''}"
-        self.db.body[i]["desc"] = desc # The player's customized description for this part.
-        self.db.body[i]["can_be_missing"] = can_be_missing # If False, ignores all aspects of missing messages/mechanics.
-        self.db.body[i]["is_missing"] = is_missing # Is the body part omitted from the player?
-        self.db.body[i]["is_optional"] = is_optional # If true, the part will not be reported if missing.
-        self.db.body[i]["is_abstract"] = is_abstract # Used for the 'general' body part, so you can't put clothes on it somehow.
-        self.db.body[i]["is_covered"] = is_covered # Is it covered by clothing or otherwise hidden?
-        self.db.body[i]["is_prosthetic"] = is_prosthetic # Does the player have a mechanical/false version?
-        self.db.body[i]["is_inappropriate"] = is_inappropriate # Will NPCs freak out if the player walks around with it exposed?
-        self.db.body[i]["is_heavy"] = is_heavy # For 3rd/4th arms, tank treads, etc. Imposes balance penalties.
-        self.db.body[i]["can_be_injured"] = can_be_injured # Self-explanatory. False for things like hair, etc.
-        self.db.body[i]["injury_level"] = injury_level # How injured is it? [0 - 3]
+        self.ndb.body_layout = None
 
     def _reset_species_flags(self):
         self.db.has_four_arms = False
@@ -138,6 +122,72 @@ class Character(DefaultCharacter):
         self.db.is_halfbreed = False
         self.db.has_bioluminescence = False
 
+    @lazy_property
+    def attributes(self):
+        return VersionedAttributeHandler(self)
+
+    @lazy_property
+    def stats(self):
+        return StatHandler(self)
+
+    def at_attribute_change(self, key):
+        # The stat handler saving its own values. They're already live, and already in the prompt.
+        if key in STATS and self.stats.flushing:
+            return
+
+        if key in APPEARANCE_ATTRIBUTES or key in ANATOMY_ATTRIBUTES or key == None:
+            self.touch()
+        if key == "visibility":
+            occupancy.refresh(self)
+        elif key in PROMPT_ATTRIBUTES or key == None:
+            self.invalidate_prompt()
+
+        if key in ANATOMY_ATTRIBUTES or key == None:
+            self.ndb.body_layout = None
+        if key in ("species", "is_halfbreed", "halfbreed_family") or key == None:
+            self.ndb.species = None
+        if key == "abilities" or key == None:
+            self.ndb.tree_levels = None
+            if self.has_account:
+                self.refresh_ability_cmdset()
+
+        # Stats written straight to the database replace the live ones.
+        if key in STATS:
+            self.stats.reload(key)
+        elif key == None:
+            for stat in STATS:
+                self.stats.reload(stat)
+
+    def touch(self):
+        "Marks the character's cached appearance as out of date. Writing an appearance attribute does this automatically."
+        self.ndb.version = (self.ndb.version or 0) + 1
+
+    def at_stat_change(self, stat):
+        self.invalidate_prompt()
+
+    def at_post_puppet(self, **kwargs):
+        super().at_post_puppet(**kwargs)
+        # Now connected, so the room counts us among its players.
+        occupancy.refresh(self)
+        # Balance timers live in memory. If one was lost (say, to a crash), start it over.
+        if not self.db.balance and self.db.balance_time and not scheduler.pending(self, "balance"):
+            scheduler.schedule(self, "balance", self.db.balance_time, "recover_balance")
+        # The ability cmdset isn't saved, and has to be put back after a reload.
+        self.ndb.ability_commands = None
+        self.refresh_ability_cmdset()
+
+    def at_post_unpuppet(self, account, session = None, **kwargs):
+        location = self.location
+        super().at_post_unpuppet(account, session = session, **kwargs)
+        # Either still here as an unconnected character, or stashed away entirely.
+        occupancy.refresh(self, location)
+        self.stats.flush()
+
+    def at_object_delete(self):
+        occupancy.relocate(self, self.location, None)
+        self.stats.discard()
+        return True
+
     def at_before_say(self, message, proceed = True, **kwargs):
         return message, proceed
 
@@ -152,9 +202,25 @@ class Character(DefaultCharacter):
         # Passed before the desc appears.
         pass
 
+    @property
+    def species_data(self):
+        "The character's shared Species definition (half-breed traits included), or None."
+        species = self.ndb.species
+        if species == None:
+            key = self.db.species
+            if isinstance(key, Species):
+                # Not migrated yet.
+                key = key.name
+
+            species = get_species(key, self.db.halfbreed_family if self.db.is_halfbreed else None)
+            self.ndb.species = species
+
+        return species
+
     @property
     def precision_information(self):
-        return self.db.species.precision_information
+        species = self.species_data
+        return species.precision_information if species else False
 
     def compare_height(self, looker):
         l_h, s_h = looker.db.height, self.db.height
@@ -188,11 +254,8 @@ class Character(DefaultCharacter):
         # Current use cases are for Idols, Blackbirds, and admin players.
         precise = looker.precision_information
 
-        # Build the necessary description components for the header.
-        age_string = f"Heuristic analysis suggests {self.they('are')} {an(self.species())}, {self.age} years of age." if precise \
-            else f"{capital(self.they('appear'))} to be {an(self.age_description())} {self.species()}."
-        h_string = f"approximately {self.height}cm tall" if precise \
-            else f"{self.height_description()} for {self.their()} kind"
+        # The description components for the header that don't depend on who's looking.
+        age_string, h_string = self.appearance_header(precise)
         h_comp = "about the same height as"
         if precise:
             h_comp = "precisely as tall as" if looker.height == self.height \
@@ -209,6 +272,43 @@ class Character(DefaultCharacter):
 
         return string
 
+    def appearance(self):
+        "Returns the cache of appearance parts that are the same for every viewer, emptied whenever the character changes."
+        cached = self.ndb.appearance
+        if cached == None or cached["version"] != self.ndb.version:
+            cached = {"version": self.ndb.version}
+            self.ndb.appearance = cached
+
+        return cached
+
+    def appearance_header(self, precise):
+        "Returns the age and height strings shown to someone looking at the character."
+        cached = self.appearance()
+        key = "precise_header" if precise else "header"
+        if key not in cached:
+            age_string = f"Heuristic analysis suggests {self.they('are')} {an(self.species())}, {self.age} years of age." if precise \
+                else f"{capital(self.they('appear'))} to be {an(self.age_description())} {self.species()}."
+            h_string = f"approximately {self.height}cm tall" if precise \
+                else f"{self.height_description()} for {self.their()} kind"
+            cached[key] = (age_string, h_string)
+
+        return cached[key]
+
+    def msg(self, text = None, from_obj = None, session = None, options = None, buffered = True, **kwargs):
+        """
+        Plain text sent while a command is running is buffered, and goes out in one piece
+        when the command's done (see utilities.output). Anything else flushes the buffer
+        first, so that nothing arrives out of order.
+        """
+        if buffered:
+            if isinstance(text, str) and from_obj == None and session == None and options == None and not kwargs:
+                if output.write(self, text):
+                    return
+
+            output.flush(self)
+
+        super().msg(text = text, from_obj = from_obj, session = session, options = options, **kwargs)
+
     def echo(self, string, prompt = False, error = False):
         # At this moment, simply a lazy method wrapper that sends a message to the object,
         # then displays a prompt.
@@ -217,42 +317,42 @@ class Character(DefaultCharacter):
 
         self.msg(string)
         if prompt == True:
-            self.msg(prompt = self.prompt())
+            self.queue_prompt()
 
     def error_echo(self, string, prompt = False):
         self.echo(string, prompt = prompt, error = True)
 
     @property
     def hp(self):
-        return self.db.hp["current"]
+        return self.stats.hp.current
 
     @property
     def max_hp(self):
-        return self.db.hp["max"]
+        return self.stats.hp.max
 
     @property
     def en(self):
-        return self.db.en["current"]
+        return self.stats.en.current
 
     @property
     def max_en(self):
-        return self.db.en["max"]
+        return self.stats.en.max
 
     @property
     def sc(self):
-        return self.db.sc["current"]
+        return self.stats.sc.current
 
     @property
     def max_sc(self):
-        return self.db.sc["max"]
+        return self.stats.sc.max
 
     @property
     def xp(self):
-        return self.db.xp["current"]
+        return self.stats.xp.current
 
     @property
     def max_xp(self):
-        return self.db.xp["max"]
+        return self.stats.xp.max
 
     @property
     def prone(self):
@@ -280,10 +380,10 @@ class Character(DefaultCharacter):
     def use_balance(self, t):
         self.db.balance = False
         self.db.balance_time = t
-        tickerhandler.add(self.db.balance_time, self.recover_balance)
+        scheduler.schedule(self, "balance", t, "recover_balance")
 
     def recover_balance(self):
-        tickerhandler.remove(self.db.balance_time, self.recover_balance)
+        scheduler.cancel(self, "balance")
         self.db.balance = True
         self.db.balance_time = 0
         self.echo("|c(|C!|c)|n You can act again.", prompt = True)
@@ -299,8 +399,39 @@ class Character(DefaultCharacter):
         return "default"
 
     def prompt(self):
-        "Returns the object's prompt, if applicable."
+        "Returns the object's prompt, if applicable. Cached until something it shows changes."
         status = self.prompt_status()
+        cached = self.ndb.prompt
+        if cached and cached[0] == status:
+            return cached[1]
+
+        p_string = self.render_prompt(status)
+        self.ndb.prompt = (status, p_string)
+        return p_string
+
+    def invalidate_prompt(self):
+        "Marks the cached prompt as out of date. Writing to the prompt's attributes or changing a stat does this on its own."
+        self.ndb.prompt = None
+
+    def queue_prompt(self):
+        """
+        Sends the prompt once the current command (or tick) is done. However many times
+        this is called in the meantime, only one prompt goes out.
+        """
+        if self.ndb.prompt_queued:
+            return
+
+        self.ndb.prompt_queued = True
+        delay(0, self.flush_prompt)
+
+    def flush_prompt(self):
+        if not self.ndb.prompt_queued:
+            return
+
+        self.ndb.prompt_queued = False
+        self.msg(prompt = self.prompt())
+
+    def render_prompt(self, status):
         p_string = ""
 
         if status == "default":
@@ -340,10 +471,107 @@ class Character(DefaultCharacter):
 
     def has_ability(self, ability_key, level = 1):
         "Checks to see if the player has a given ability. If a level is provided, it will only pass True if the ability score is that level or higher."
-        if not ability_key in self.db.abilities:
+        return self.ability_level(ability_key) >= level
+
+    def ability_level(self, ability_key):
+        return (self.db.abilities or {}).get(ability_key, 0)
+
+    def set_ability_level(self, ability_key, level):
+        "Sets the ability to a level (0 to unlearn it), adjusting the total of its tree to match."
+        old = self.ability_level(ability_key)
+        if level == old:
+            return
+
+        if self.db.abilities == None:
+            self.db.abilities = {}
+
+        # Changed in place, which leaves the tree levels alone; they're adjusted by the difference instead.
+        if level > 0:
+            self.db.abilities[ability_key] = level
+        else:
+            del self.db.abilities[ability_key]
+
+        tree = abilities.ability_tree(ability_key)
+        cached = self.ndb.tree_levels
+        if tree and cached and cached[0] == abilities.version:
+            cached[1][tree] = cached[1].get(tree, 0) + level - old
+
+        self.refresh_ability_cmdset()
+
+    def tree_levels(self):
+        "Returns the uncapped total level of each of the character's ability trees, by tree key. Do not modify."
+        cached = self.ndb.tree_levels
+        if cached and cached[0] == abilities.version:
+            return cached[1]
+
+        levels = {}
+        for ab, lvl in (self.db.abilities or {}).items():
+            tree = abilities.ability_tree(ab)
+            if tree:
+                levels[tree] = levels.get(tree, 0) + lvl
+
+        self.ndb.tree_levels = (abilities.version, levels)
+        return levels
+
+    def tree_level(self, tree_key):
+        "The tree's level: the total of its abilities' levels, up to the tree's maximum."
+        tree = abilities.get_tree(tree_key)
+        if not tree:
+            return 0
+
+        return min(self.tree_levels().get(tree_key, 0), tree.max_level())
+
+    def has_tree(self, tree_key, level = 1):
+        return self.tree_level(tree_key) >= level
+
+    def meets_requirements(self, requirements):
+        "Checks a set of requirements, formatted as {\"abilities\": {key: level}, \"trees\": {key: level}}."
+        for ab, lvl in requirements.get("abilities", {}).items():
+            if not self.has_ability(ab, lvl):
+                return False
+
+        for tree, lvl in requirements.get("trees", {}).items():
+            if not self.has_tree(tree, lvl):
+                return False
+
+        return True
+
+    def tree_unlocked(self, tree_key):
+        "Whether the tree shows for the character. Hidden trees show once their requirements are met."
+        tree = abilities.get_tree(tree_key)
+        return tree != None and (not tree.hidden or self.meets_requirements(tree.requirements))
+
+    def unlocked_commands(self):
+        "Returns the names of the commands the character's abilities and ability trees grant."
+        names = set()
+        for ab, lvl in (self.db.abilities or {}).items():
+            names.update(cmd for tier, cmd in abilities.tier_commands(ab) if lvl >= tier)
+
+        for tree in self.tree_levels():
+            lvl = self.tree_level(tree)
+            names.update(cmd for tier, cmd in abilities.tier_commands(tree) if lvl >= tier)
+
+        return frozenset(names)
+
+    def refresh_ability_cmdset(self):
+        "Rebuilds the cmdset of ability commands, if the commands the character's unlocked have changed."
+        unlocked = self.unlocked_commands()
+        if unlocked == self.ndb.ability_commands:
+            return
+
+        self.ndb.ability_commands = unlocked
+        self.cmdset.remove(ABILITY_CMDSET)
+        if unlocked:
+            self.cmdset.add(ABILITY_CMDSET, permanent = False)
+
+    def can_raise_ability(self, ability_key):
+        "Whether the ability can be trained another level - it's below its maximum, and so is its tree."
+        ability = abilities.get_ability(ability_key)
+        if not ability or not ability.can_train() or self.ability_level(ability.key) >= ability.max_level():
             return False
 
-        if self.db.abilities[ability_key] < level:
+        tree = abilities.ability_tree(ability.key)
+        if tree and self.tree_level(tree) >= abilities.get_tree(tree).max_level():
             return False
 
         return True
@@ -393,7 +621,11 @@ class Character(DefaultCharacter):
             return
 
         # Player passed. Get destination, send them on through.
-        destination = loc.exit_destination(dir)
+        destination = loc.exit_room(dir)
+        if not destination:
+            self.error_echo("You can't seem to figure out how to get there.")
+            return
+
         self.move_to(destination)
 
     def move_to(self, destination, quiet = False, move_hooks = True, move_msg = None, **kwargs):
@@ -410,6 +642,23 @@ class Character(DefaultCharacter):
         # if we've gotten to move_to, everything is green and we are ready
         # to move the object.
 
+        # Convert destination to actual room. Exits hand us the room object itself; anything
+        # else ("#id" strings, names) goes through the room resolver before a full search.
+        if not isinstance(destination, ObjectDB):
+            destination = get_room(destination) or self.search(destination, global_search = True)
+
+        if not destination:
+            self.error_echo("You can't seem to figure out how to get there.")
+            return False
+
+        with Timer("move") as timer:
+            moved = self._move_to(destination, quiet = quiet, move_hooks = move_hooks, move_msg = move_msg, **kwargs)
+
+        self.ndb.last_move_time = timer.elapsed
+        return moved
+
+    def _move_to(self, destination, quiet = False, move_hooks = True, move_msg = None, **kwargs):
+        "The movement itself, once move_to() has resolved the destination."
         def error_msg(string = "", err = None):
             """Simple log helper method"""
             logger.log_trace()
@@ -418,12 +667,6 @@ class Character(DefaultCharacter):
 
         errtxt = ("Method move_to failed at: ('%s').")
 
-        # Convert destination to actual room.
-        destination = self.search(destination, global_search = True)
-        if not destination:
-            self.error_echo("You can't seem to figure out how to get there.")
-            return False
-
         if move_hooks:
             try:
                 if not self.at_before_move(destination):
@@ -454,6 +697,9 @@ class Character(DefaultCharacter):
             error_msg(errtxt % "location change", err)
             return False
 
+        # Rooms' hooks keep their occupancy current, but those can be skipped.
+        occupancy.relocate(self, source_location, destination)
+
         if not quiet:
             # Tell the new room we are there.
             try:
@@ -493,7 +739,8 @@ class Character(DefaultCharacter):
     def at_look(self, target = None, **kwargs):
         # If the player has no species or their species doesn't override at_look,
         # use the default functionality.
-        if not self.db.species or self.db.species.at_look != True:
+        species = self.species_data
+        if not species or species.at_look != True:
             if not target.access(self, "view"):
                 try:
                     return "Could not view '%s'." % target.get_display_name(self, **kwargs)
@@ -508,7 +755,7 @@ class Character(DefaultCharacter):
 
             return description
 
-        return self.db.species.at_look(self, target = None, **kwargs)
+        return species.at_look(self, target = None, **kwargs)
 
     def zone(self):
         loc = self.location
@@ -534,7 +781,8 @@ class Character(DefaultCharacter):
         return self.db.surname if self.db.surname else ""
 
     def species(self):
-        return self.db.species.name if self.db.species else "Unknown"
+        species = self.species_data
+        return species.name if species else "Unknown"
 
     def they(self, word = None):
         return f"{self.db.pronoun_they} {self.pluralize(word)}" if word else self.db.pronoun_they
@@ -613,11 +861,7 @@ class Character(DefaultCharacter):
         if self.they() == "they":
             return string
 
-        # Sometimes we have to step in, in special cases where the inflect engine fails.
-        if string == "are":
-            return "is"
-
-        return plural(string)
+        return conjugate(string)
 
     def message(self, self_m = None, target = None, tar_m = None, witness_m = None, prompt = True, witness_prompt = False):
         """A specifically formatted message that originates from the Character. Special tokens are used to populate data and facilitate the writing of combat or other game messages.
@@ -638,39 +882,12 @@ class Character(DefaultCharacter):
         if self_m == None:
             return
 
-        if target:
-            self_m = self_m.replace("TARGET_THEY", target.they())
-            self_m = self_m.replace("TARGET_THEM", target.them())
-            self_m = self_m.replace("TARGET_THEIR", target.their())
-            self_m = self_m.replace("TARGET_THEIRS", target.theirs())
-            self_m = self_m.replace("TARGET", target.name)
-            self_m = message_token_pluralize(self_m, "#", target)
-            self_m = message_token_capitalize(self_m)
-
+        # Templates are parsed once and cached, so only the names, pronouns and verbs are filled in here.
+        self_m = render_message(self_m, player = self, target = target, viewer = self)
         if tar_m:
-            tar_m = tar_m.replace("PLAYER_THEY", self.they())
-            tar_m = tar_m.replace("PLAYER_THEM", self.them())
-            tar_m = tar_m.replace("PLAYER_THEIR", self.their())
-            tar_m = tar_m.replace("PLAYER_THEIRS", self.theirs())
-            tar_m = tar_m.replace("PLAYER", self.name)
-            tar_m = message_token_pluralize(tar_m, "!", self)
-            tar_m = message_token_capitalize(tar_m)
-
+            tar_m = render_message(tar_m, player = self, target = target, viewer = target)
         if witness_m:
-            if target:
-                witness_m = witness_m.replace("TARGET_THEY", target.they())
-                witness_m = witness_m.replace("TARGET_THEM", target.them())
-                witness_m = witness_m.replace("TARGET_THEIR", target.their())
-                witness_m = witness_m.replace("TARGET_THEIRS", target.theirs())
-                witness_m = witness_m.replace("TARGET", target.name)
-            witness_m = witness_m.replace("PLAYER_THEY", self.they())
-            witness_m = witness_m.replace("PLAYER_THEM", self.them())
-            witness_m = witness_m.replace("PLAYER_THEIR", self.their())
-            witness_m = witness_m.replace("PLAYER_THEIRS", self.theirs())
-            witness_m = witness_m.replace("PLAYER", self.name)
-            witness_m = message_token_pluralize(witness_m, "!", self)
-            witness_m = message_token_pluralize(witness_m, "#", target)
-            witness_m = message_token_capitalize(witness_m)
+            witness_m = render_message(witness_m, player = self, target = target)
 
         self.echo(self_m, prompt = prompt)
         if tar_m:
@@ -712,67 +929,97 @@ class Character(DefaultCharacter):
         return self.identity()
 
     def age_description(self):
-        return self.db.species.age_description(self.db.age)
+        return self.species_data.age_description(self.db.age)
 
     def height_description(self):
-        return self.db.species.height_description(self.db.height)
+        return self.species_data.height_description(self.db.height)
 
-    def build_bodypart_names(self):
-        "Used to update the list of valid body part aliases the character has. Can change based on removal/additions of body parts."
-        b_tbl = {}
-        for i in self.db.body:
-            b_tbl[self.db.body[i]["key"]] = i
-            b_tbl[self.db.body[i]["plural_name"]] = i
-            for a in self.db.body[i]["aliases"]:
-                b_tbl[a] = i
+    def body_layout(self):
+        "Returns the character's BodyLayout, shared with everyone of the same anatomy."
+        layout = self.ndb.body_layout
+        if layout == None:
+            layout = body_layout(*(bool(self.attributes.get(flag)) for flag in ANATOMY_ATTRIBUTES))
+            self.ndb.body_layout = layout
 
-        return b_tbl
+        return layout
+
+    def body_table(self):
+        "Returns the character's body overlay, {part key: {changed fields}}."
+        body = self.db.body
+        if not body:
+            return {}
+
+        # Bodies used to store every part's full definition, by position.
+        if any(isinstance(k, int) for k in body):
+            body = convert_body(body)
+            self.db.body = body
+
+        return body
 
     def _valid_bodypart(self, b_part):
-        if len(self.db.bodypart_names) < 1:
-            return None
+        return self.body_layout().find(b_part)
 
-        if b_part in self.db.bodypart_names:
-            b_part = self.db.bodypart_names[b_part]
+    def _part_state(self, part, field):
+        return self.body_table().get(part.key, {}).get(field, OVERLAY_DEFAULTS[field])
 
-        try:
-            b = self.db.body[b_part]
-            return b_part
-        except KeyError:
-            return None
+    def bodypart_state(self, b_part, field):
+        "Returns one of the part's per-character fields (see OVERLAY_DEFAULTS)."
+        part = self._valid_bodypart(b_part)
+        if part == None:
+            return OVERLAY_DEFAULTS[field]
 
-    def has_bodypart(self, b_part):
-        if self._valid_bodypart(b_part) == None:
-            return False
+        return self._part_state(part, field)
+
+    def bodypart_set_state(self, b_part, field, value):
+        part = self._valid_bodypart(b_part)
+        if part == None:
+            return
 
-        b_part = self._valid_bodypart(b_part)
+        body = dict(self.body_table())
+        state = dict(body.get(part.key, {}))
+        if value == OVERLAY_DEFAULTS[field]:
+            state.pop(field, None)
+        else:
+            state[field] = value
+
+        if state:
+            body[part.key] = state
+        else:
+            body.pop(part.key, None)
 
-        if self.db.body[b_part]["is_missing"]:
+        self.db.body = body
+
+    def has_bodypart(self, b_part):
+        part = self._valid_bodypart(b_part)
+        if part == None:
             return False
 
-        return True
+        return not self._part_state(part, "is_missing")
 
     def bodypart_name(self, b_part):
-        b_part = self._valid_bodypart(b_part)
-        return "" if b_part == None else self.db.body[b_part]["fullname"]
+        part = self._valid_bodypart(b_part)
+        return "" if part == None else part.fullname
 
     def bodypart_desc(self, b_part):
-        b_part = self._valid_bodypart(b_part)
-        return "" if b_part == None else self.db.body[b_part]["desc"]
+        return self.bodypart_state(b_part, "desc")
 
     def bodypart_set_desc(self, b_part, string):
-        b_part = self._valid_bodypart(b_part)
-        if b_part != None:
-            self.db.body[b_part]["desc"] = string
+        self.bodypart_set_state(b_part, "desc", string)
 
     @property
     def compiled_description(self):
-        string = ""
-        for i in self.db.body:
-            d = self.db.body[i]["desc"]
-            string += f"{' ' if d else ''}{d}"
+        "The body part descriptions, joined up. Cached until the body (or anything else about the character) changes."
+        cached = self.appearance()
+        if "description" not in cached:
+            body = self.body_table()
+            string = ""
+            for part in self.body_layout().parts:
+                d = body.get(part.key, {}).get("desc", "")
+                string += f"{' ' if d else ''}{d}"
+
+            cached["description"] = string.strip()
 
-        return string.strip()
+        return cached["description"]
 
     @property
     def bioluminescence_color_code(self):
@@ -800,12 +1047,12 @@ class Character(DefaultCharacter):
         return self.db.visibility
 
     def damage(self, dmg, msg):
-        new_hp = self.db.hp["current"] - dmg
+        new_hp = self.hp - dmg
         if new_hp < 0:
             # well the character should die, but we haven't gotten that far yet
             new_hp = 1
 
-        self.db.hp["current"] = new_hp
+        self.stats.set("hp", new_hp)
         if msg:
             self.echo(msg)
         self.echo(f"|rYou take |R{dmg}|r damage.", prompt = True)
\ No newline at end of file
@@ -13,6 +13,7 @@ inheritance.
 from evennia import DefaultObject
 from evennia.utils import logger
 import data.visibility as vis
+from world import occupancy
 
 class Object(DefaultObject):
     """
@@ -236,6 +237,9 @@ class Object(DefaultObject):
             error_msg(errtxt % "location change", err)
             return False
 
+        # Rooms' hooks keep their occupancy current, but those can be skipped.
+        occupancy.relocate(self, source_location, destination)
+
         if not quiet:
             # Tell the new room we are there.
             try:
@@ -263,6 +267,10 @@ class Object(DefaultObject):
                 return False
         return True
 
+    def at_object_delete(self):
+        occupancy.relocate(self, self.location, None)
+        return True
+
     @property
     def visibility(self):
         return vis.NORMAL
\ No newline at end of file
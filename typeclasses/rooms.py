@@ -1,6 +1,3 @@
-# Python
-from datetime import datetime
-
 # Evennia modules.
 from evennia import DefaultRoom
 from evennia.objects.models import ObjectDB
@@ -9,15 +6,19 @@ from evennia.utils.utils import (variable_from_module, lazy_property, make_iter,
 
 # Blackbirds modules.
 from commands.default_cmdsets import ChargenCmdSet
+from data import exits as ex
 from data import visibility as vis
+from typeclasses.attributes import VersionedAttributeHandler
 from utilities.display import header, divider
-from utilities.emotes import msg_tokenize
-from utilities.room import get_room, get_room_id, room_characters
+from utilities.emotes import compile_emote
+from utilities.room import get_room, invalidate_room, room_characters
 from utilities.string import jleft, jright, punctuate
 import utilities.directions as dirs
 from typeclasses.environments import Environment
 from typeclasses.areas import Area
 from typeclasses.zones import Zone
+from world import climate, clock, spatial
+from world.occupancy import Occupancy, PLAYERS, NPCS, THINGS
 from world.map import Map
 from utilities.debugging import debug_echo
 
@@ -79,16 +80,94 @@ class Room(DefaultRoom):
         self.db.symbol_override = False
         self.db.hidden = False
 
+    @lazy_property
+    def attributes(self):
+        return VersionedAttributeHandler(self)
+
+    def at_attribute_change(self, key):
+        self.touch()
+        if key in climate.CLIMATE_ATTRIBUTES or key == None:
+            climate.invalidate(self.db.zone)
+
+    def touch(self):
+        "Marks the room's cached appearance as out of date. Any db write does this automatically."
+        self.ndb.version = (self.ndb.version or 0) + 1
+
     def update(self):
-        pass
+        # Converts rooms still storing their exits in the old per-direction dictionary format.
+        self.exit_table()
+
+    def occupancy(self):
+        "Returns the room's Occupancy, building it from the room's contents if it's not been yet (or after a reload)."
+        occ = self.ndb.occupancy
+        if occ == None:
+            occ = Occupancy(self.contents)
+            self.ndb.occupancy = occ
+
+        return occ
+
+    def at_object_receive(self, moved_obj, source_location, **kwargs):
+        self.occupancy().add(moved_obj)
+
+    def at_object_leave(self, moved_obj, target_location, **kwargs):
+        self.occupancy().remove(moved_obj)
 
     @property
     def characters(self):
-        return [obj for obj in self.contents if obj.has_account]
+        "Connected players in the room. Do not modify."
+        return self.occupancy().players
 
     def build_exits(self):
-        self.db.exits = {}
-        _ = [self.reset_exit(dir) for dir in ("northwest", "north", "northeast", "west", "east", "southwest", "south", "southeast", "up", "down", "in", "out")]
+        # Exits are packed into two fixed-size tuples, one slot per direction in DIRECTION_MAP:
+        # the destination room's id (0 for no exit), and a bitmask of flags from data.exits.
+        slots = len(dirs.DIRECTION_MAP)
+        self.db.exits = ((ex.NO_EXIT,) * slots, (ex.DEFAULT,) * slots)
+
+    def exit_table(self):
+        "Returns the room's (destinations, flags) exit tuples."
+        table = self.db.exits
+        if isinstance(table, dict):
+            table = self._convert_exits(table)
+        elif not table:
+            self.build_exits()
+            table = self.db.exits
+
+        return table
+
+    def _convert_exits(self, old_exits):
+        dests, flags = [], []
+        for dir in dirs.DIRECTION_MAP:
+            e = old_exits.get(dir) or {}
+            dest = get_room(e.get("dest"))
+            dests.append(dest.id if dest else ex.NO_EXIT)
+
+            f = 0
+            f |= ex.VISIBLE if e.get("visible", True) else 0
+            f |= ex.DOOR if e.get("door", False) else 0
+            f |= ex.LOCKED if e.get("locked", False) else 0
+            f |= ex.ACCESSIBLE if e.get("accessible", True) else 0
+            flags.append(f)
+
+        table = (tuple(dests), tuple(flags))
+        self.db.exits = table
+        return table
+
+    def _exit_slot(self, dir):
+        dir = dirs.get_full_direction(dir) if dir else None
+        return dirs.DIRECTION_MAP.index(dir) if dir else None
+
+    def _set_exit(self, dir, dest_id, flags = None):
+        slot = self._exit_slot(dir)
+        if slot == None:
+            return
+
+        dests, cur_flags = self.exit_table()
+        dests = dests[:slot] + (dest_id,) + dests[slot + 1:]
+        if flags != None:
+            cur_flags = cur_flags[:slot] + (flags,) + cur_flags[slot + 1:]
+
+        self.db.exits = (dests, cur_flags)
+        spatial.touch_room(self)
 
     def delete(self):
         global _ScriptDB
@@ -105,14 +184,16 @@ class Room(DefaultRoom):
 
         # Destroy any exits to this room, if any.
         for e in self.get_exits():
-            dest_room = get_room(self.db.exits[e]['dest'])
+            dest_room = self.exit_room(e)
             if dest_room:
                 opp_e = dirs.opposite_direction(e)
                 dest_room.reset_exit(opp_e)
 
-        # Remove this room from its zone.
+        # Remove this room from its zone, and from the map.
         if self.db.zone:
             self.db.zone.remove_room(self)
+        spatial.unindex_room(self)
+        invalidate_room(self)
 
         # Clear out any non-exit objects located within the object
         self.clear_contents()
@@ -125,31 +206,29 @@ class Room(DefaultRoom):
         return True
 
     def _valid_exit(self, dir):
-        if not self.db.exits[dir]:
-            return False
-
-        if self.db.exits[dir] == None:
+        slot = self._exit_slot(dir)
+        if slot == None:
             return False
 
-        if self.db.exits[dir]["dest"] == None:
-            return False
-
-        return True
+        return self.exit_table()[0][slot] != ex.NO_EXIT
 
     def get_exits(self, visible_only = False):
         exit_list = []
+        dests, flags = self.exit_table()
 
-        if not self.db.exits:
-            return []
-
-        for dir in self.db.exits:
-            if not self._valid_exit(dir):
+        for slot, dest in enumerate(dests):
+            if dest == ex.NO_EXIT:
                 continue
 
-            if visible_only and (self.db.exits[dir]["visible"] != True or get_room(self.db.exits[dir]["dest"]).db.hidden == True):
-                continue
+            if visible_only:
+                if not flags[slot] & ex.VISIBLE:
+                    continue
+
+                dest_room = get_room(dest)
+                if not dest_room or dest_room.db.hidden == True:
+                    continue
 
-            exit_list.append(dir)
+            exit_list.append(dirs.DIRECTION_MAP[slot])
 
         return exit_list
 
@@ -157,10 +236,57 @@ class Room(DefaultRoom):
         return self._valid_exit(dir)
 
     def reset_exit(self, dir):
-        self.db.exits[dir] = {"dest": None, "visible": True, "door": False, "locked": False, "accessible": True}
+        self._set_exit(dir, ex.NO_EXIT, ex.DEFAULT)
 
     def exit_destination(self, dir):
-        return self.db.exits[dir]["dest"] if self.has_exit(dir) else None
+        "Returns the '#id' of the room the exit leads to, or None."
+        slot = self._exit_slot(dir)
+        if slot == None:
+            return None
+
+        dest = self.exit_table()[0][slot]
+        return f"#{dest}" if dest != ex.NO_EXIT else None
+
+    def exit_room(self, dir):
+        "Returns the room object the exit leads to, or None."
+        slot = self._exit_slot(dir)
+        if slot == None:
+            return None
+
+        dest = self.exit_table()[0][slot]
+        return (get_room(dest) or None) if dest != ex.NO_EXIT else None
+
+    def exit_flag(self, dir, flag):
+        "Checks one of the exit's flags (see data.exits)."
+        slot = self._exit_slot(dir)
+        if slot == None:
+            return False
+
+        return bool(self.exit_table()[1][slot] & flag)
+
+    def set_exit_flag(self, dir, flag, value = True):
+        slot = self._exit_slot(dir)
+        if slot == None:
+            return
+
+        f = self.exit_table()[1][slot]
+        f = f | flag if value else f & ~flag
+        self._set_exit(dir, self.exit_table()[0][slot], f)
+
+    def exit_info(self, dir):
+        "The exit's data in the old dictionary form, for code that still wants it."
+        slot = self._exit_slot(dir)
+        if slot == None:
+            return None
+
+        dests, flags = self.exit_table()
+        return {
+            "dest": f"#{dests[slot]}" if dests[slot] != ex.NO_EXIT else None,
+            "visible": bool(flags[slot] & ex.VISIBLE),
+            "door": bool(flags[slot] & ex.DOOR),
+            "locked": bool(flags[slot] & ex.LOCKED),
+            "accessible": bool(flags[slot] & ex.ACCESSIBLE),
+        }
 
     def create_exit(self, dir, dest):
         err_msg = "|xCould not create a new exit. %s|n"
@@ -181,16 +307,16 @@ class Room(DefaultRoom):
             err_msg = err_msg % "The specified room already has an exit leading in the other direction."
             return False, err_msg
 
-        d_id = get_room_id(dest)
-        s_id = get_room_id(self)
+        d_id = dest.id
+        s_id = self.id
 
-        # Final failsafe - ensure we pulled up a valid room ID.
-        if d_id == False or s_id == False:
+        # Final failsafe - ensure we have valid room IDs.
+        if not d_id or not s_id:
             err_msg = err_msg % "Unable to produce a valid room ID."
             return False, err_msg
 
-        self.db.exits[dir]["dest"] = d_id
-        dest.db.exits[opp_dir]["dest"] = s_id
+        self._set_exit(dir, d_id)
+        dest._set_exit(opp_dir, s_id)
 
         return True, ""
 
@@ -202,7 +328,7 @@ class Room(DefaultRoom):
             err_msg = err_msg % f"There is no {dir}ward exit."
             return False, err_msg
 
-        dest = get_room(self.exit_destination(dir))
+        dest = self.exit_room(dir)
 
         if dest and not oneway:
             opp_dir = dirs.opposite_direction(dir)
@@ -214,54 +340,76 @@ class Room(DefaultRoom):
 
     def echo(self, msg, type = None, origin = None, prompt = False):
         if type == "emote":
-            # Snowflakey handling for emotes, to parse @tokens.
-            for ply in self.characters:
-                ply.echo(msg_tokenize(ply, msg), prompt = True)
+            # Snowflakey handling for emotes, to parse @tokens. Parsed once, then rendered for each viewer.
+            players = self.characters
+            if isinstance(msg, str):
+                msg = compile_emote(msg, players)
+
+            for ply in players:
+                ply.echo(msg.render(ply), prompt = True)
 
         else:
             viewers = [ply for ply in self.characters if (origin and ply != origin)]
             for ply in viewers:
-                ply.echo(msg, prompt = ply.prompt())
+                ply.echo(msg, prompt = prompt)
 
     def at_desc(self, looker=None, **kwargs):
         # Seems to process things before the room is looked at.
         pass
 
+    def appearance(self):
+        """
+        Returns the parts of the room's appearance that are the same for every viewer,
+        rendering them again only if the room, its zone or the world has changed since.
+        """
+        version = (self.ndb.version, spatial.zone_version(self.db.zone))
+        cached = self.ndb.appearance
+        if cached and cached["version"] == version:
+            return cached
+
+        desc = self.description()
+        if desc:
+            desc = desc.replace("$p", "\n\n")
+            desc = desc.replace("$n", "\n")
+
+        exit_list = self.get_exits(visible_only = True)
+        if exit_list:
+            exits = f"|235You see exits leading {list_to_string(exit_list)}|n."
+        else:
+            exits = "|235You see no exits.|n"
+
+        cached = {
+            "version": version,
+            "title": self.format_room_title(),
+            "desc": desc,
+            "insulated": self.db.insulated,
+            "indoors": self.db.indoors,
+            "exits": exits,
+        }
+        self.ndb.appearance = cached
+        return cached
+
     def return_appearance(self, looker, **kwargs):
         if not looker:
             return ""
 
         # Grab all accessible objects in room.
-        visible = (con for con in self.contents if con != looker and con.access(looker, "view") and con.visibility == vis.NORMAL)
-        exit_list = self.get_exits(visible_only = True)
-        players, things = [], []
+        occ = self.occupancy()
+        players = [con.name for con in occ.get(PLAYERS, visibility = vis.NORMAL) if con != looker and con.access(looker, "view")]
+        # Everything else goes into our generic list of items.
+        things = [con.db.long_desc for con in occ.get(NPCS, THINGS, visibility = vis.NORMAL) if con != looker and con.access(looker, "view")]
 
-        for con in visible:
-            # Get the content's name.
-            key = con.get_display_name(looker)
-
-            # If the content is a player, add to the players list.
-            if con.has_account:
-                # if con.account.is_superuser:
-                #     users.append(f"|Y{key}|n")
-                # else:
-                players.append(f"{con.name}")
-
-            else:
-                # Goes into our generic list of items.
-                things.append(con.db.long_desc)
+        # Everything that doesn't depend on the viewer comes pre-rendered.
+        cached = self.appearance()
 
-        string = self.format_room_title()
+        string = cached["title"]
         string += "\n%s" % Map(looker, max_width = 9, max_height = 9).draw_map()
 
-        desc = self.description()
+        desc = cached["desc"]
         if desc:
-            desc = desc.replace("$p", "\n\n")
-            desc = desc.replace("$n", "\n")
-
-            if not self.db.insulated:
+            if not cached["insulated"]:
                 desc = f"{self.get_temperature_string(looker)} {desc}"
-            if not self.db.indoors or (self.db.indoors and looker.precision_information):
+            if not cached["indoors"] or (cached["indoors"] and looker.precision_information):
                 desc = f"{self.get_time_string(looker)} {desc}"
 
             string += f"\n{desc}"
@@ -276,16 +424,14 @@ class Room(DefaultRoom):
                 string += p_desc
 
         # string += "\n  %s" % self.get_illumination_string()
-        if self.db.water_level > 0:
-            string += "\n  %s" % self.get_water_level_string()
+        water = self.get_water_level_string()
+        if water:
+            string += "\n  %s" % water
 
         exit_prepend = ""
         if looker.account.check_permstring("Developer"):
             exit_prepend = f"|124[{self.name}]|n "
-        if exit_list:
-            string += f"\n\n{exit_prepend}|235You see exits leading {list_to_string(exit_list)}|n."
-        else:
-            string += f"\n\n{exit_prepend}|235You see no exits.|n"
+        string += f"\n\n{exit_prepend}{cached['exits']}"
 
         return string
 
@@ -310,9 +456,27 @@ class Room(DefaultRoom):
 
         return "|xThe space around you cannot be made sense of - the only concession to the mortal mind is that amidst the inchoate and swirling static that surrounds you, the visual noise underfoot is as solid as stone, serving as a \"floor.\" All around you is a relentless buzzing of junk data, and with it, the sound of an impossibly vast ocean, churning and hissing away into eternity.|n"
 
+    def temperature(self):
+        "The room's current temperature, from its zone's climate. Falls back on the room's own setting."
+        temp = climate.room_value(self, "temp")
+        return temp if temp != None else self.db.temperature
+
+    def water_level(self):
+        level = climate.room_value(self, "water")
+        return level if level != None else self.db.water_level
+
+    def illumination(self):
+        light = climate.room_value(self, "light")
+        if light == None:
+            light = 0 if self.db.darkness else self.db.illumination
+
+        return light
+
     def get_temperature_string(self, ply):
-        temp = self.db.temperature
-        if ply.precision_information:
+        return self.temperature_string(self.temperature(), ply.precision_information)
+
+    def temperature_string(self, temp, precise = False):
+        if precise:
             return "|510The current temperature is %d C.|n" % temp
         else:
             if temp <= -23: # -10 F
@@ -337,29 +501,13 @@ class Room(DefaultRoom):
                 return "|510It's incredibly hot.|n"
 
     def get_time_string(self, ply):
-        now = datetime.now().time()
         if ply.precision_information:
-            return now.strftime("|550The current time is %T.|n")
-        else:
-            if now.hour >= 0 and now.hour < 4:
-                return "|103The moon hangs high in the sky.|n"
-            elif now.hour >= 4 and now.hour < 6:
-                return "|225A telltale bluish hue in the horizon tells of the oncoming dawn.|n"
-            elif now.hour >= 6 and now.hour < 10:
-                return "|431The sun begins to peek in the horizon.|n"
-            elif now.hour >= 10 and now.hour < 12:
-                return "|441Sunlight shines from the east as the Delight slowly climbs to its peak.|n"
-            elif now.hour >= 12 and now.hour < 16:
-                return "|550The Delight hangs at its peak, causing shadows to grow short.|n"
-            elif now.hour >= 16 and now.hour < 18:
-                return "|441The sky begins to darken as the sun falls to the west.|n"
-            elif now.hour >= 18 and now.hour < 20:
-                return "|225A smattering of stars join the moon in the sky.|n"
-            elif now.hour >= 20 and now.hour < 23:
-                return "|104Moonlight shines down upon you.|n"
+            return clock.now().strftime("|550The current time is %T.|n")
+
+        return clock.time_string()
 
     def get_illumination_string(self):
-        light = self.db.illumination
+        light = self.illumination()
 
         if light <= 0:
             return "|212It's completely dark.|n"
@@ -373,7 +521,7 @@ class Room(DefaultRoom):
             return "|553The place is bathed in bright light.|n"
 
     def get_water_level_string(self):
-        level = self.db.water_level
+        level = self.water_level()
 
         if level <= 0:
             return None
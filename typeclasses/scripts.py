@@ -14,6 +14,8 @@ just overloads its hooks to have it perform its function.
 
 from evennia import DefaultScript
 
+from world import tick
+
 
 class Script(DefaultScript):
     """
@@ -89,3 +91,15 @@ class Script(DefaultScript):
 
     """
     pass
+
+
+class WorldTick(Script):
+    "Drives the world tick (see world.tick), running update() on occupied zones every interval."
+    def at_script_creation(self):
+        self.key = tick.SCRIPT_KEY
+        self.desc = "Updates zones with players in them."
+        self.interval = tick.TICK_INTERVAL
+        self.persistent = True
+
+    def at_repeat(self):
+        tick.run()
@@ -1,6 +1,22 @@
+"""
+Species.
+
+One shared definition per species, looked up by key ("human", "carven"...) with
+get_species(). Characters store only the key in db.species. Definitions are frozen
+once registered - a character's own choices (horns, tail, halfbreed family) are
+kept on the character, never on the species.
+
+Half-breed Humans pick up the traits in HALFBREED_TRAITS from the other side of the
+family. Each combination is its own shared definition, built the first time it's
+asked for.
+"""
+# Python modules.
+import copy
+
 class Species():
     def __init__(self):
         # Species-specific naming info.
+        self.key = None
         self.name = None
         self.plural_name = None
         self.society = None
@@ -46,6 +62,16 @@ class Species():
         # Misc.
         self.playable = True
         self.chargen_documentation = None
+        self.halfbreed_family = None
+
+    def __setattr__(self, name, value):
+        if self.__dict__.get("_frozen"):
+            raise AttributeError(f"Species definitions are shared, and can't be changed ({self.name}.{name}).")
+
+        super().__setattr__(name, value)
+
+    def freeze(self):
+        self._frozen = True
 
     def update(self):
         pass
@@ -98,6 +124,7 @@ class Human(Species):
     def __init__(self):
         super().__init__()
 
+        self.key = "human"
         self.name = "Human"
         self.plural_name = "Humans"
         self.society = "Humanity"
@@ -123,6 +150,7 @@ class Carven(Species):
     def __init__(self):
         super().__init__()
 
+        self.key = "carven"
         self.name = "Carven"
         self.plural_name = "Carven"
         self.society = "Carvendom"
@@ -149,6 +177,7 @@ class Sacrilite(Species):
     def __init__(self):
         super().__init__()
 
+        self.key = "sacrilite"
         self.name = "Sacrilite"
         self.plural_name = "Sacrilites"
         self.society = "Sacrility"
@@ -175,6 +204,7 @@ class Luum(Species):
     def __init__(self):
         super().__init__()
 
+        self.key = "luum"
         self.name = "Luum"
         self.plural_name = "Luumi"
         self.society = "Luumdom"
@@ -206,6 +236,7 @@ class Idol(Species):
     def __init__(self):
         super().__init__()
 
+        self.key = "idol"
         self.name = "Idol"
         self.plural_name = "Idols"
         self.society = "Synthesis"
@@ -237,6 +268,7 @@ class Idol(Species):
 class Blackbird(Species):
     def __init__(self):
         super().__init__()
+        self.key = "blackbird"
         self.name = "Blackbird"
         self.plural_name = "Blackbirds"
         self.society = "the Assassinocracy"
@@ -276,4 +308,54 @@ class Blackbird(Species):
                 "Never without a blade.",
             ],
             "difficulty": "The world will bend easily beneath your talons, but keeping your mind intact will prove to be a nightmare."
-        }
\ No newline at end of file
+        }
+# Traits a half-breed Human inherits from the other side of the family.
+HALFBREED_TRAITS = {
+    "Carven": {
+        "has_horns": True,
+        "horns_optional": True,
+    },
+    "Sacrilite": {
+        "has_fangs": True,
+        "fang_choice": True,
+        "fangs_optional": True,
+        "has_tail": True,
+        "tail_optional": True,
+    },
+    "Luum": {
+        "has_fangs": True,
+        "fangs_optional": True,
+        "has_bioluminescence": True,
+        "bioluminescence_optional": True,
+        "can_eat_anything": True,
+    },
+}
+
+# Key -> shared Species, and (key, family) -> shared half-breed Species.
+_SPECIES = {}
+_HALFBREEDS = {}
+
+def register(species):
+    species.freeze()
+    _SPECIES[species.key] = species
+
+for _cls in (Human, Carven, Sacrilite, Luum, Idol, Blackbird):
+    register(_cls())
+
+def all_species():
+    return list(_SPECIES.values())
+
+def get_species(key, halfbreed_family = None):
+    "Returns the shared definition of the species, or None. Half-breeds only apply to species that can halfbreed."
+    species = _SPECIES.get(key.lower()) if key else None
+    if not species or not halfbreed_family or not species.can_halfbreed or halfbreed_family not in HALFBREED_TRAITS:
+        return species
+
+    found = _HALFBREEDS.get((species.key, halfbreed_family))
+    if not found:
+        found = copy.copy(species)
+        found.__dict__.update(HALFBREED_TRAITS[halfbreed_family])
+        found.__dict__["halfbreed_family"] = halfbreed_family
+        _HALFBREEDS[(species.key, halfbreed_family)] = found
+
+    return found
@@ -0,0 +1,118 @@
+"""
+Character stats.
+
+hp, en, sc and xp are kept in memory by a StatHandler (character.stats), and written
+back to their db attributes in batches: every FLUSH_INTERVAL seconds, when the
+character logs out, and when the server stops. A hit or an XP award changes two
+slotted fields and marks the stat dirty, rather than pickling and saving the whole
+{"current": x, "max": y} dict each time.
+
+Writing one of the db attributes directly (self.db.hp = {...}) still works - the
+character reloads that stat from the database - but changing it in place
+(self.db.hp["current"] = 5) bypasses the handler and will be overwritten.
+"""
+# Evennia modules.
+from evennia.utils import logger
+from evennia.utils.utils import delay
+
+# Stats kept by the handler, all stored as {"current": x, "max": y}.
+STATS = ("hp", "en", "sc", "xp")
+# Seconds between writes of dirty stats to the database.
+FLUSH_INTERVAL = 30
+
+# Handlers with unsaved changes.
+_DIRTY = set()
+_FLUSH_QUEUED = False
+
+class Stat():
+    __slots__ = ("current", "max")
+
+    def __init__(self, current = 0, max = 0):
+        self.current = current
+        self.max = max
+
+    def as_dict(self):
+        return {"current": self.current, "max": self.max}
+
+class StatHandler():
+    "The live values of a character's stats."
+    __slots__ = ("obj", "hp", "en", "sc", "xp", "dirty", "flushing")
+
+    def __init__(self, obj):
+        self.obj = obj
+        self.dirty = set()
+        # True while the handler's writing its own values back, so the character doesn't reload them.
+        self.flushing = False
+        for stat in STATS:
+            self.reload(stat)
+
+    def reload(self, stat):
+        "Reads the stat back in from the database, dropping any unsaved change."
+        stored = self.obj.attributes.get(stat) or {}
+        setattr(self, stat, Stat(stored.get("current", 0), stored.get("max", 0)))
+        self.dirty.discard(stat)
+
+    def get(self, stat):
+        return getattr(self, stat)
+
+    def set(self, stat, current = None, max = None):
+        "Changes the stat's current and/or max value."
+        entry = getattr(self, stat)
+        if current != None:
+            entry.current = current
+        if max != None:
+            entry.max = max
+
+        self._changed(stat)
+
+    def add(self, stat, amount):
+        "Adds to the stat's current value."
+        getattr(self, stat).current += amount
+        self._changed(stat)
+
+    def _changed(self, stat):
+        self.dirty.add(stat)
+        _mark(self)
+
+        hook = getattr(self.obj, "at_stat_change", None)
+        if hook:
+            hook(stat)
+
+    def flush(self):
+        "Writes every changed stat to the database in one batch."
+        _DIRTY.discard(self)
+        if not self.dirty:
+            return
+
+        dirty, self.dirty = self.dirty, set()
+        self.flushing = True
+        try:
+            self.obj.attributes.batch_add(*[(stat, getattr(self, stat).as_dict()) for stat in dirty])
+        finally:
+            self.flushing = False
+
+    def discard(self):
+        "Drops any unsaved changes, e.g. when the character's being deleted."
+        self.dirty.clear()
+        _DIRTY.discard(self)
+
+def _mark(handler):
+    global _FLUSH_QUEUED
+    _DIRTY.add(handler)
+    if not _FLUSH_QUEUED:
+        _FLUSH_QUEUED = True
+        delay(FLUSH_INTERVAL, _timed_flush)
+
+def _timed_flush():
+    global _FLUSH_QUEUED
+    _FLUSH_QUEUED = False
+    flush_all()
+
+def flush_all():
+    "Writes out every character's unsaved stats. Called on a timer, and at server stop."
+    while _DIRTY:
+        handler = _DIRTY.pop()
+        try:
+            handler.flush()
+        except Exception:
+            logger.log_trace(f"Stats: flushing {handler.obj} failed.")
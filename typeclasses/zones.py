@@ -3,6 +3,12 @@ from evennia import DefaultObject
 
 # Blackbirds modules.
 from utilities.string import jleft, jright
+from world import climate, clock, spatial, tick
+
+def announce_phase(old_phase, new_phase):
+    "Tells the zones players are in that the time of day has changed. Subscribed to the game clock at server start."
+    for zone in tick.active_zones():
+        zone.at_phase_change(new_phase)
 
 def zone_list():
     text = f"There are |W{Zone.objects.count()}|n zones defined in Blackbirds.\n"
@@ -24,9 +30,22 @@ class Zone(DefaultObject):
         self.db.area = 0
         self.db.open_pvp = False
         self.db.rooms = []
+        spatial.clear_zone(self)
 
     def update(self):
-        pass
+        # Advances the climate of every room in the zone. Called by the world tick.
+        climate.step(self)
+
+    def at_phase_change(self, phase):
+        # Sunrise, sunset and the like, for everyone who can see the sky.
+        msg = clock.PHASE_ECHOES.get(phase)
+        if not msg:
+            return
+
+        for room in self.rooms():
+            if room != None and not room.db.indoors:
+                for ply in room.characters:
+                    ply.echo(msg, prompt = True)
 
     def fullname(self):
         return self.db.fullname
@@ -48,11 +67,14 @@ class Zone(DefaultObject):
             return
 
         self.db.rooms.append(room)
+        spatial.index_room(room)
 
     def remove_room(self, room):
         if room in self.db.rooms:
             self.db.rooms.remove(room)
 
+        spatial.unindex_room(room)
+
     def rooms(self):
         return self.db.rooms
 
@@ -61,4 +83,5 @@ class Zone(DefaultObject):
             if room != None: # In case of malformed entries.
                 room.db.zone = None
 
-        self.db.rooms = []
\ No newline at end of file
+        self.db.rooms = []
+        spatial.clear_zone(self)
\ No newline at end of file
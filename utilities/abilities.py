@@ -1,46 +1,160 @@
-from typeclasses.abilities import Ability
+"""
+The ability registry.
+
+Every Ability defined in ABILITY_MODULES is instantiated once, by build(), and
+indexed by key, lowercase name and alias. Looking an ability up is then a dict
+lookup rather than a walk over every Ability subclass. Ability trees are
+registered alongside, with a reverse index of which tree each ability is in.
+
+build() runs at server start (and on first use, should anything ask sooner);
+rebuild() reimports the ability modules, for picking up changes without a restart.
+Anything cached from the registry can compare against version to know it's stale.
+"""
+# Python modules.
+import importlib, sys
+
+# Blackbirds modules.
+from typeclasses.abilities import Ability, AbilityTree
+
+# Modules abilities are defined in.
+ABILITY_MODULES = ("abilities.core_stats", "abilities.misc", "abilities.trees")
+
+# Key -> Ability.
+_ABILITIES = {}
+# Key, lowercase name or alias -> key.
+_INDEX = {}
+# Key -> {"name": name, "description": description, "tiers": tiers}, as returned by ability_list().
+_LIST = {}
+# Tree key -> AbilityTree, and ability key -> the key of the tree it's in.
+_TREES = {}
+_TREE_OF = {}
+# Ability or tree key -> ((tier, command name), ...), from the tiers' "cmd:" entries.
+_COMMANDS = {}
+_BUILT = False
+# Bumped on every build.
+version = 0
+
+def _subclasses(cls):
+    for sub in cls.__subclasses__():
+        # Reloading a module leaves its old classes behind as subclasses; only take the ones it still defines.
+        module = sys.modules.get(sub.__module__)
+        if getattr(module, sub.__name__, None) is sub:
+            yield sub
+        yield from _subclasses(sub)
+
+def _tier_commands(tiers):
+    # Pulls the "cmd: <name>" entries out of a set of tiers.
+    commands = []
+    for tier, info in tiers.items():
+        for text in ((info,) if isinstance(info, str) else info):
+            if text[:4].lower() == "cmd:":
+                commands.append((tier, text[4:].strip().lower()))
+
+    return tuple(commands)
+
+def build():
+    "Instantiates and indexes every ability. Called at server start."
+    global _BUILT, version
+    _ABILITIES.clear()
+    _INDEX.clear()
+    _LIST.clear()
+    _TREES.clear()
+    _TREE_OF.clear()
+    _COMMANDS.clear()
+
+    for module in ABILITY_MODULES:
+        importlib.import_module(module)
+
+    for ab in _subclasses(Ability):
+        a = ab()
+        _ABILITIES[a.key] = a
+        _LIST[a.key] = {"name": a.name, "description": a.description(), "tiers": a.tiers}
+        _COMMANDS[a.key] = _tier_commands(a.tiers)
+
+    # Keys first, so a name or alias can never shadow another ability's key.
+    for key, a in _ABILITIES.items():
+        for name in (a.name.lower(), *(alias.lower() for alias in a.aliases)):
+            _INDEX.setdefault(name, key)
+    for key in _ABILITIES:
+        _INDEX[key] = key
+
+    for tr in _subclasses(AbilityTree):
+        t = tr()
+        _TREES[t.key] = t
+        _COMMANDS[t.key] = _tier_commands(t.tiers)
+        for member in t.members:
+            _TREE_OF[member] = t.key
+
+    _BUILT = True
+    version += 1
+
+def rebuild():
+    "Reimports the ability modules and builds the registry again."
+    for module in ABILITY_MODULES:
+        importlib.reload(importlib.import_module(module))
+
+    build()
+
+def _registry():
+    if not _BUILT:
+        build()
+
+    return _ABILITIES
+
+def all_abilities():
+    return list(_registry().values())
+
+def get_ability(ab):
+    "Returns the Ability with the given key, name or alias, or None."
+    key = ability_search(ab)
+    return _ABILITIES.get(key) if key else None
 
 def ability_list():
     """
     Returns a dictionary of all defined abilities in the game, formatted as follows:
-        ability_key = {"name": name, "description": description}
+        ability_key = {"name": name, "description": description, "tiers": tiers}
+    Shared - do not modify.
     """
-    ab_list = {}
-    for ab in Ability.__subclasses__():
-        a = ab()
-        ab_list[a.key] = {"name": a.name, "description": a.description(), "tiers": a.tiers}
-
-    return ab_list
+    _registry()
+    return _LIST
 
 def ability_search(ab):
     """
-    Accepts any name and attempts to return a valid ability key, whether by supplied key or by full name.
+    Accepts any name and attempts to return a valid ability key, whether by supplied key, full name or alias.
     """
-    ab = ab.lower()
+    if not ab:
+        return None
+
+    _registry()
+    return _INDEX.get(ab.lower())
+
+def all_trees():
+    _registry()
+    return list(_TREES.values())
 
-    ab_list = ability_list()
-    if ab in ab_list.keys():
-        # Already have a key, no need to continue.
-        return ab
+def get_tree(key):
+    "Returns the AbilityTree with the given key, or None."
+    _registry()
+    return _TREES.get(key)
 
-    for a in ab_list.keys():
-        if ab == ab_list[a]["name"].lower():
-            # Found the name, return the key.
-            return a
+def ability_tree(ab):
+    "Returns the key of the tree the ability belongs to, or None."
+    _registry()
+    return _TREE_OF.get(ab)
 
-    return None
+def tier_commands(key):
+    "Returns the commands the ability or tree grants, as ((tier, command name), ...)."
+    _registry()
+    return _COMMANDS.get(key, ())
 
 def get_ability_name(ab):
-    ab = ability_search(ab)
-    ab_list = ability_list()
-    return ab_list[ab]["name"] if ab in ab_list else None
+    a = get_ability(ab)
+    return a.name if a else None
 
 def get_ability_description(ab):
-    ab = ability_search(ab)
-    ab_list = ability_list()
-    return ab_list[ab]["description"] if ab in ab_list else None
+    a = get_ability(ab)
+    return a.description() if a else None
 
 def get_ability_tiers(ab):
-    ab = ability_search(ab)
-    ab_list = ability_list()
-    return ab_list[ab]["tiers"] if ab in ab_list else None
\ No newline at end of file
+    a = get_ability(ab)
+    return a.tiers if a else None
@@ -2,6 +2,7 @@
 from evennia.server.sessionhandler import SESSION_HANDLER
 
 # Blackbirds modules.
+from utilities.layout import width as text_width
 from utilities.string import autoformat, jleft, jright, wrap
 
 # For use with the color chart.
@@ -26,7 +27,7 @@ def divider(width = 80, color = "B", indent = 0, symbol = "-"):
 def header(title, width = 80, color = "B", title_color = "W", indent = 0, symbol = "-"):
     color = str(color)
     title_color = str(title_color)
-    width -= 4 + len(title) + (indent * 2)
+    width -= 4 + text_width(title) + (indent * 2)
 
     if not title:
         return divider(width, color, indent, symbol)
@@ -34,8 +35,8 @@ def header(title, width = 80, color = "B", title_color = "W", indent = 0, symbol
     return "%s|%s%s |%s%s |%s%s|n" % (" " * indent, color, symbol * 2, title_color, title, color, symbol * width)
 
 def column(title, value, title_width = None, value_width = None, indent = 2, title_color = "x", value_color = "w", col_color = "c"):
-    title_width = title_width if title_width else len(str(title))
-    value_width = value_width if value_width else len(str(value))
+    title_width = title_width if title_width else text_width(title)
+    value_width = value_width if value_width else text_width(value)
 
     title = str(title)
     value = str(value)
@@ -1,17 +1,118 @@
+"""
+Emote compilation.
+
+An emote is parsed once, when it's entered, into a stream of literal text and
+character tokens. Each recipient then gets their own copy by walking the stream
+with a pronoun table - whoever a token points at reads "you"/"your", everyone else
+reads the name or pronoun.
+
+Tokens:
+  @name                               The character's name.
+  @name_they, _them, _their, _theirs  The character's pronouns.
+  "speech"                            Colored as speech.
+
+@me is swapped for the emoter's name by the emote command before compiling.
+"""
+# Python modules.
 import re
 
+# Blackbirds modules.
+from utilities.string import capital
+
+# @name, optionally followed by a pronoun. The name is matched lazily so a trailing _they is read as the pronoun,
+# and longer pronouns come first so @name_theirs isn't read as @name_their + "s".
+_TOKEN = re.compile(r"@(\w+?)(?:_(theirs|their|them|they))?(?!\w)")
+# A token here starts a sentence, and should be capitalized.
+_SENTENCE_END = re.compile(r"[.!?]\s+$")
+
+# The pronoun table for whoever the token points at.
+_SECOND_PERSON = {
+    None: "you",
+    "they": "you",
+    "them": "you",
+    "their": "your",
+    "theirs": "yours",
+}
+
 def _extract_tokens(msg):
-    return re.findall(msg, r"(@[\w_]+)")
+    return _TOKEN.findall(msg)
+
+def _pronoun_table(char):
+    return {
+        None: char.name,
+        "they": char.they(),
+        "them": char.them(),
+        "their": char.their(),
+        "theirs": char.theirs(),
+    }
+
+class CompiledEmote():
+    """
+    A parsed emote. Parts are either literal strings or (character, pronoun, capitalize)
+    tuples, where pronoun is None for the character's name.
+    """
+    def __init__(self, text, parts, targets):
+        self.text = text
+        self.parts = parts
+        # Everyone referenced by a token, in order of first mention.
+        self.targets = targets
+        # Character -> pronoun table, for everyone but the recipient.
+        self._tables = {char: _pronoun_table(char) for char in targets}
+
+    def render(self, recipient):
+        "Returns the emote as the recipient should read it."
+        out = []
+        for part in self.parts:
+            if isinstance(part, str):
+                out.append(part)
+                continue
+
+            char, pronoun, cap = part
+            word = (_SECOND_PERSON[pronoun] if char == recipient else self._tables[char][pronoun]) or ""
+            out.append(capital(word) if cap and word else word)
+
+        return "".join(out)
+
+def _compile_text(text, chars, parts, targets, starts_sentence):
+    pos = 0
+    for match in _TOKEN.finditer(text):
+        char = chars.get(match.group(1).lower())
+        if not char:
+            # Nobody here by that name - leave the token as written.
+            continue
+
+        if match.start() > pos:
+            parts.append(text[pos:match.start()])
+
+        if char not in targets:
+            targets.append(char)
+
+        cap = bool(_SENTENCE_END.search(text, 0, match.start())) if match.start() else starts_sentence
+        parts.append((char, match.group(2), cap))
+        pos = match.end()
+
+    if pos < len(text):
+        parts.append(text[pos:])
+
+def compile_emote(msg, characters = ()):
+    """
+    Parses an emote into a CompiledEmote. Characters are those who tokens may refer to,
+    usually everyone in the room.
+    """
+    chars = {char.name.lower(): char for char in characters}
+    parts, targets = [], []
 
-def msg_tokenize(name, msg):
-    # Replace all tokens directed to the character with first-person pronouns.
-    msg = msg.replace(f"@{name}_they", "you")
-    msg = msg.replace(f"@{name}_them", "you")
-    msg = msg.replace(f"@{name}_their", "your")
-    msg = msg.replace(f"@{name}_theirs", "yours")
-    msg = msg.replace(f"@{name}", "you")
+    # Every other segment between quotes is speech.
+    for i, segment in enumerate(msg.split('"')):
+        if i % 2:
+            parts.append('|C"')
+            _compile_text(segment, chars, parts, targets, True)
+            parts.append('"|n')
+        else:
+            _compile_text(segment, chars, parts, targets, i == 0)
 
-    # All other tokens are to be parsed with their own pronouns accordingly.
-    # TODO: regex compilation of all tokens
+    return CompiledEmote(msg, tuple(parts), targets)
 
-    return msg
\ No newline at end of file
+def msg_tokenize(recipient, msg, characters = ()):
+    "Renders a single emote for a single recipient. Compile once with compile_emote() when there are many."
+    return compile_emote(msg, tuple(characters) or (recipient,)).render(recipient)
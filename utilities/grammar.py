@@ -0,0 +1,59 @@
+"""
+Grammar service.
+
+One shared inflect engine for the whole process, with every answer it gives
+memoized - articles, plurals and the like come from a small set of words that get
+asked about over and over. The verbs the game's own messages use are conjugated
+at server start, so those are never worked out mid-combat.
+"""
+# Python modules.
+import inflect
+from functools import lru_cache
+
+_ENGINE = None
+# Verbs that inflect gets wrong.
+_VERB_OVERRIDES = {
+    "are": "is",
+}
+# Verbs used by the message templates and pronoun helpers shipped with the game. Add to this
+# when writing a template with a new !verb or #verb.
+TEMPLATE_VERBS = ("appear", "are", "drop")
+
+def engine():
+    "Returns the shared inflect engine."
+    global _ENGINE
+    if _ENGINE == None:
+        _ENGINE = inflect.engine()
+        _ENGINE.classical(ancient = True)
+
+    return _ENGINE
+
+@lru_cache(maxsize = 4096)
+def article(string):
+    "Prefixes a string with 'a ' or 'an '."
+    return engine().a(string)
+
+@lru_cache(maxsize = 4096)
+def plural(string):
+    return engine().plural(string)
+
+@lru_cache(maxsize = 1024)
+def ordinal(string):
+    return engine().ordinal(string)
+
+@lru_cache(maxsize = 1024)
+def number_words(n):
+    return engine().number_to_words(n)
+
+@lru_cache(maxsize = 1024)
+def conjugate(verb):
+    "Returns the verb as it follows he/she/it: 'drop' -> 'drops'."
+    if verb in _VERB_OVERRIDES:
+        return _VERB_OVERRIDES[verb]
+
+    return plural(verb)
+
+def warm_up():
+    "Conjugates the verbs in TEMPLATE_VERBS ahead of time. Called at server start."
+    for verb in TEMPLATE_VERBS:
+        conjugate(verb)
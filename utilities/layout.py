@@ -0,0 +1,129 @@
+"""
+ANSI-aware text layout.
+
+Strings full of Evennia color markup are parsed once into runs of (style, text),
+where style is the markup leading into that stretch of visible text. Parses are
+cached by the string itself, so measuring the same score sheet label or ability
+name a second time costs a dict lookup instead of an ANSI strip.
+"""
+# Python modules.
+import re
+from functools import lru_cache
+
+# Markup codes: ||, |n, |r, |R, |123, |[123, |=a, |[=a, |/, |_ and friends. |_r and the like are
+# the background colors set up in COLOR_ANSI_EXTRA_MAP, and have to be matched ahead of |_.
+_CODE = re.compile(r"\|(?:\||_[rgybmcwx]|\[?(?:[0-5]{3}|=[a-z]|[a-zA-Z])|[/_\-*^>])")
+# Codes that stand for visible text.
+_VISIBLE = {
+    "||": "|",
+    "|_": " ",
+    "|/": "\n",
+    "|-": "\t",
+}
+
+class Text():
+    "A parsed markup string."
+    __slots__ = ("raw", "runs", "plain", "width")
+
+    def __init__(self, raw, runs):
+        self.raw = raw
+        self.runs = runs
+        self.plain = "".join(text for _, text in runs)
+        self.width = len(self.plain)
+
+@lru_cache(maxsize = 8192)
+def parse(string):
+    "Returns the string as a Text of (style, text) runs. Cached."
+    runs = []
+    style = ""
+    pos = 0
+    for match in _CODE.finditer(string):
+        if match.start() > pos:
+            runs.append((style, string[pos:match.start()]))
+            style = ""
+
+        code = match.group(0)
+        visible = _VISIBLE.get(code)
+        if visible != None:
+            runs.append((style, visible))
+            style = ""
+        else:
+            style += code
+
+        pos = match.end()
+
+    if pos < len(string):
+        runs.append((style, string[pos:]))
+        style = ""
+
+    if style:
+        # Trailing markup, e.g. a closing |n.
+        runs.append((style, ""))
+
+    return Text(string, tuple(runs))
+
+def width(string):
+    "Returns how many characters of the string are actually displayed."
+    return parse(str(string)).width
+
+def plain(string):
+    "Returns the string with all markup removed."
+    return parse(str(string)).plain
+
+def jleft(string, width = 0):
+    string = str(string)
+    return string + (" " * (width - parse(string).width))
+
+def jright(string, width = 0):
+    string = str(string)
+    return (" " * (width - parse(string).width)) + string
+
+def truncate(string, length, ellipsis = "..."):
+    "Cuts the string down to a displayed length, ellipsis included, keeping its markup intact."
+    text = parse(str(string))
+    if text.width <= length:
+        return text.raw
+
+    room = length - len(ellipsis)
+    out = []
+    styled = False
+    for style, chunk in text.runs:
+        if room <= 0:
+            break
+
+        # Visible pipes were written as ||, and have to be again.
+        out.append(style + chunk[:room].replace("|", "||"))
+        styled = styled or bool(style)
+        room -= len(chunk)
+
+    out.append(ellipsis)
+    if styled:
+        out.append("|n")
+
+    return "".join(out)
+
+def wrap(string, width = 80, initial_indent = 0, subsequent_indent = 0):
+    "Wraps the string to the displayed width, measuring each word only once."
+    str_list = string.split()
+    str_list.insert(0, " " * initial_indent)
+
+    output_list = []
+    output_string = ""
+    cur_len = 0
+
+    for i, word in enumerate(str_list):
+        word_len = parse(word).width
+        space = " " if i > 1 else ""
+        cur_len += word_len
+        if i > 1:
+            cur_len += 1
+        if cur_len <= width:
+            output_string += space + word
+        else:
+            output_list.append(output_string)
+            cur_len = word_len + subsequent_indent
+            output_string = (" " * subsequent_indent) + word
+
+    output_list.append(output_string)
+
+    return "\n".join(output_list)
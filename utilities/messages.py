@@ -0,0 +1,100 @@
+"""
+Message templates, as used by Character.message().
+
+A template is parsed once (and cached by its text) into literal text and tokens.
+Rendering then only fills in names, pronouns and verbs from whoever is acting.
+
+PLAYER, TARGET: The character's or target's name.
+PLAYER_THEY, _THEM, _THEIR, _THEIRS (and TARGET_*): Their pronouns.
+!verb, #verb: A verb from the character or the target, written in singular form. It's
+    pluralized to match their pronouns, unless they're the one reading it ("you").
++word: Capitalizes the word. Works on the tokens above, too (+PLAYER_THEY).
+"""
+# Python modules.
+import re
+from functools import lru_cache
+
+# Blackbirds modules.
+from utilities.string import capital
+
+PLAYER = "PLAYER"
+TARGET = "TARGET"
+
+# Longer pronouns come first, so that _THEIRS isn't read as _THEIR + "S".
+_TOKEN = re.compile(r"(\+)?(?:(PLAYER|TARGET)(?:_(THEIRS|THEIR|THEM|THEY))?|([!#])(\w+))|\+(\w+)")
+_VERB_ROLES = {"!": PLAYER, "#": TARGET}
+
+def _pronoun(char, pronoun):
+    if pronoun == None:
+        return char.name
+
+    return getattr(char, pronoun.lower())()
+
+class MessageTemplate():
+    """
+    A parsed template. Parts are either literal strings, or (kind, role, value, capitalize, raw)
+    tuples - kind being "pronoun" (value None for the name) or "verb", and raw the token as written.
+    """
+    def __init__(self, text, parts):
+        self.text = text
+        self.parts = parts
+
+    def render(self, player = None, target = None, viewer = None):
+        "Fills the template in for the viewer. Tokens for a missing character are left as written."
+        chars = {PLAYER: player, TARGET: target}
+
+        out = []
+        for part in self.parts:
+            if isinstance(part, str):
+                out.append(part)
+                continue
+
+            kind, role, value, cap, raw = part
+            char = chars[role]
+            if char == None:
+                out.append(raw)
+                continue
+
+            if kind == "verb":
+                word = value if char == viewer else char.pluralize(value)
+            else:
+                word = _pronoun(char, value)
+
+            out.append(capital(word) if cap and word else word)
+
+        return "".join(out)
+
+@lru_cache(maxsize = 1024)
+def compile_message(text):
+    "Parses a template into a MessageTemplate. Cached, so repeat templates are only ever parsed once."
+    parts = []
+    pos = 0
+    for match in _TOKEN.finditer(text):
+        if match.start() > pos:
+            parts.append(text[pos:match.start()])
+        pos = match.end()
+
+        cap, role, pronoun, verb_mark, verb, word = match.groups()
+        if word:
+            # A plain +word, capitalized once here.
+            parts.append(capital(word))
+        elif role:
+            parts.append(("pronoun", role, pronoun, bool(cap), match.group(0)))
+        else:
+            parts.append(("verb", _VERB_ROLES[verb_mark], verb, bool(cap), match.group(0)))
+
+    if pos < len(text):
+        parts.append(text[pos:])
+
+    # Merge neighbouring literals, so rendering walks as few parts as possible.
+    merged = []
+    for part in parts:
+        if isinstance(part, str) and merged and isinstance(merged[-1], str):
+            merged[-1] += part
+        else:
+            merged.append(part)
+
+    return MessageTemplate(text, tuple(merged))
+
+def render_message(text, player = None, target = None, viewer = None):
+    return compile_message(text).render(player = player, target = target, viewer = viewer)
@@ -0,0 +1,57 @@
+"""
+Output buffering.
+
+While a command runs, text sent to characters is collected here instead of going
+out one msg() at a time, then flushed as one combined message per character when
+the command's done. Witnesses in the room are buffered alongside the caller.
+
+Commands open a buffer for their caller in at_pre_cmd and close it in at_post_cmd.
+Each caller's buffers nest - a command run from inside another only flushes when the
+outer one closes - and are counted separately, so a command left waiting on a
+deferred doesn't hold up anyone else's. A command that raises never reaches
+at_post_cmd, and closes its caller's buffers with abort() instead.
+"""
+# Caller -> how many buffers they have open.
+_OPEN = {}
+# Character -> list of pending text, in the order it was first written to.
+_PENDING = {}
+
+def begin(caller):
+    "Opens a buffer for the caller's command."
+    _OPEN[caller] = _OPEN.get(caller, 0) + 1
+
+def end(caller):
+    "Closes the caller's buffer, flushing everything once their outermost one is closed."
+    depth = _OPEN.get(caller, 0) - 1
+    if depth > 0:
+        _OPEN[caller] = depth
+        return
+
+    _OPEN.pop(caller, None)
+    flush_all()
+
+def abort(caller):
+    "Closes every buffer the caller has open and flushes. For commands that error out."
+    _OPEN.pop(caller, None)
+    flush_all()
+
+def buffering():
+    return len(_OPEN) > 0
+
+def write(obj, text):
+    "Buffers text for the object. Returns False if nothing's buffering, and the text should be sent now."
+    if not _OPEN:
+        return False
+
+    _PENDING.setdefault(obj, []).append(text)
+    return True
+
+def flush(obj):
+    "Sends out anything buffered for the object."
+    pending = _PENDING.pop(obj, None)
+    if pending:
+        obj.msg("\n".join(pending), buffered = False)
+
+def flush_all():
+    while _PENDING:
+        flush(next(iter(_PENDING)))
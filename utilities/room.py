@@ -2,14 +2,82 @@
 import re
 
 # Evennia modules.
+from evennia.objects.models import ObjectDB
 from evennia.utils import search
 
+# Resolved rooms, keyed by database id. Lets exits and other "#id" references skip the search pipeline.
+_ROOMS = {}
+# Room shortname (lowercase) -> database id, and the reverse, so renames can clear the old name.
+_ROOM_NAMES = {}
+_ROOM_KEYS = {}
+
+def _is_room(obj):
+    return obj.__class__.__name__ == "Room"
+
+def _dbref(name):
+    "Returns the id number behind an int or '#id' string, or None if the input is neither."
+    if isinstance(name, int):
+        return name
+
+    if isinstance(name, str) and len(name) > 1 and name[0] == "#" and name[1:].isdigit():
+        return int(name[1:])
+
+    return None
+
+def cache_room(room):
+    "Registers a room with the resolver under its id and current shortname."
+    invalidate_room(room)
+
+    key = room.key.lower()
+    _ROOMS[room.id] = room
+    _ROOM_NAMES[key] = room.id
+    _ROOM_KEYS[room.id] = key
+
+def invalidate_room(room):
+    "Forgets everything the resolver knows about a room. Call when a room is renamed or deleted."
+    room_id = room if isinstance(room, int) else room.id
+    _ROOMS.pop(room_id, None)
+
+    key = _ROOM_KEYS.pop(room_id, None)
+    if key and _ROOM_NAMES.get(key) == room_id:
+        del _ROOM_NAMES[key]
+
 def get_room(name):
-    "Produces a valid room object, given a room name."
-    room = [r for r in search.object_search(name) if r.__class__.__name__ == "Room"]
-    if len(room) > 0:
-        return room[0]
+    "Produces a valid room object, given a room name, a '#id' string, an id number, or the room itself."
+    if not name:
+        return False
 
+    if isinstance(name, ObjectDB):
+        return name if _is_room(name) else False
+
+    room_id = _dbref(name)
+    if room_id == None:
+        # Shortname lookup. Entries are checked against the room's actual key, in case it changed under us.
+        room_id = _ROOM_NAMES.get(name.lower())
+        room = _ROOMS.get(room_id)
+        if room and room.pk and room.key.lower() == name.lower():
+            return room
+
+        if room_id != None:
+            invalidate_room(room_id)
+
+        room = [r for r in search.object_search(name) if _is_room(r)]
+        if len(room) > 0:
+            cache_room(room[0])
+            return room[0]
+
+        return False
+
+    room = _ROOMS.get(room_id)
+    if room and room.pk:
+        return room
+
+    room = ObjectDB.objects.get_id(room_id)
+    if room and _is_room(room):
+        cache_room(room)
+        return room
+
+    invalidate_room(room_id)
     return False
 
 def get_room_id(name):
@@ -25,12 +93,7 @@ def sanitize_roomname(name):
     return name.lower()
 
 def roomname_exists(name):
-    r_name = [r for r in search.object_search(name) if r.__class__.__name__ == "Room"]
-
-    if len(r_name) > 0:
-        return True
-
-    return False
+    return True if get_room(name) else False
 
 def inc_roomname(name):
     "Takes the supplied room name and adds _X to it, where X is the next available unused number."
@@ -57,8 +120,8 @@ def room_characters(name, hidden_check = False, looker = None):
         return None
 
     if hidden_check and looker != None:
-        ply_list = [con for con in room.contents if con != looker and con.has_account and con.access(looker, "view")]
+        ply_list = [con for con in room.characters if con != looker and con.access(looker, "view")]
     else:
-        ply_list = [con for con in room.contents if con.has_account]
+        ply_list = list(room.characters)
 
     return ply_list
\ No newline at end of file
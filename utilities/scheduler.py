@@ -0,0 +1,128 @@
+"""
+Timer scheduler.
+
+Short-lived, single-shot timers for objects - balance recovery, roundtime,
+cooldowns. Timers live in an in-memory heap served by a single reactor call, so
+starting or cancelling one is O(log n) and touches no database tables.
+
+A timer is identified by its object and a name ("balance"), and calls a method on
+the object, by name, when it fires. Keeping to names rather than callables is what
+lets the pending timers be saved at server stop and restored at start.
+"""
+# Python modules.
+import heapq, time
+
+# Evennia modules.
+from evennia.objects.models import ObjectDB
+from evennia.server.models import ServerConfig
+from evennia.utils import logger
+from twisted.internet import reactor
+
+# ServerConfig key pending timers are saved under across reloads.
+_SAVE_KEY = "blackbirds_scheduler"
+
+# (due time, sequence, key) entries. Cancelled or rescheduled timers are left in
+# place and skipped when they come up, rather than searched for.
+_HEAP = []
+# Key -> (due time, sequence, object, method name). Key is (object id, timer name).
+_TIMERS = {}
+_SEQUENCE = 0
+# The one pending reactor call, and the time it's due.
+_CALL = None
+_CALL_AT = None
+
+def _key(obj, name):
+    return (obj.id, name)
+
+def _live(entry):
+    # Whether a heap entry is still the current timer for its key.
+    timer = _TIMERS.get(entry[2])
+    return timer != None and timer[1] == entry[1]
+
+def _arm():
+    # Makes sure the reactor call is due when the earliest timer is.
+    global _CALL, _CALL_AT
+    while _HEAP and not _live(_HEAP[0]):
+        heapq.heappop(_HEAP)
+
+    if not _HEAP:
+        if _CALL and _CALL.active():
+            _CALL.cancel()
+        _CALL, _CALL_AT = None, None
+        return
+
+    due = _HEAP[0][0]
+    if _CALL and _CALL.active():
+        if _CALL_AT == due:
+            return
+        _CALL.reset(max(due - time.time(), 0))
+    else:
+        _CALL = reactor.callLater(max(due - time.time(), 0), _run)
+
+    _CALL_AT = due
+
+def _run():
+    global _CALL, _CALL_AT
+    _CALL, _CALL_AT = None, None
+
+    now = time.time()
+    while _HEAP and _HEAP[0][0] <= now:
+        entry = heapq.heappop(_HEAP)
+        if not _live(entry):
+            continue
+
+        _, _, obj, method = _TIMERS.pop(entry[2])
+        try:
+            getattr(obj, method)()
+        except Exception:
+            logger.log_trace(f"Scheduled {method} on {obj} failed.")
+
+    _arm()
+
+def schedule(obj, name, seconds, method, due = None):
+    """
+    Calls obj.<method>() in the given number of seconds. Starting a timer with the same
+    object and name replaces the old one.
+    """
+    global _SEQUENCE
+    _SEQUENCE += 1
+
+    due = due if due != None else time.time() + seconds
+    key = _key(obj, name)
+    _TIMERS[key] = (due, _SEQUENCE, obj, method)
+    heapq.heappush(_HEAP, (due, _SEQUENCE, key))
+    _arm()
+
+def cancel(obj, name):
+    "Stops the timer, if it's running. Returns True if it was."
+    found = _TIMERS.pop(_key(obj, name), None) != None
+    if found:
+        _arm()
+
+    return found
+
+def remaining(obj, name):
+    "Returns the seconds left on the timer, or None if it isn't running."
+    timer = _TIMERS.get(_key(obj, name))
+    if not timer:
+        return None
+
+    return max(timer[0] - time.time(), 0)
+
+def pending(obj, name):
+    return _key(obj, name) in _TIMERS
+
+def save():
+    "Stores every pending timer, to be picked up by restore(). Called at server stop."
+    timers = [(obj.id, name, method, due) for (_, name), (due, _, obj, method) in _TIMERS.items()]
+    ServerConfig.objects.conf(_SAVE_KEY, value = timers)
+
+def restore():
+    "Restarts the timers saved by save(). Ones that came due while the server was down fire right away."
+    timers = ServerConfig.objects.conf(_SAVE_KEY, default = None) or []
+    ServerConfig.objects.conf(_SAVE_KEY, delete = True)
+
+    for obj_id, name, method, due in timers:
+        obj = ObjectDB.objects.get_id(obj_id)
+        if obj:
+            schedule(obj, name, 0, method, due = due)
@@ -1,15 +1,14 @@
-# Python modules.
-import re, inflect
-
-# Evennia modules.
-from evennia.utils import ansi
+# Blackbirds modules.
+from utilities import grammar
+# Measuring and justifying markup is handled by the layout engine; re-exported here for existing callers.
+from utilities.layout import jleft, jright, plain, truncate, wrap
 
 def capital(s):
     "Capitalizes the first letter of the string. Differs from Python capitalize() in that it will not perform operations on the rest of the string."
     return "%s%s" % (s[0].upper(), s[1:])
 
 def punctuate(s):
-    s = ansi.strip_ansi(s)
+    s = plain(s)
     punc = s[-1]
     if not punc in [".", ",", "'", '"', "(", ")", "!", "?", "-"]:
         s += "."
@@ -18,7 +17,7 @@ def punctuate(s):
 
 def autoformat(s, allow_breaks = True, allow_extra_spacing = False):
     "Applies certain grammatical rules to strings. Enforces a capitalized opening, automatic punctuation on the end, and performs other duties such as adding/removing paragraphs or breaking up unwanted spacing."
-    s = ansi.strip_ansi(s)
+    s = plain(s)
 
     s = capital(s)
     s = punctuate(s)
@@ -31,16 +30,6 @@ def autoformat(s, allow_breaks = True, allow_extra_spacing = False):
 
     return s
 
-def jright(string, width = 0):
-    string = str(string)
-    string_len = len(ansi.strip_ansi(string))
-    return (" " * (width - string_len)) + string
-
-def jleft(string, width = 0):
-    string = str(string)
-    string_len = len(ansi.strip_ansi(string))
-    return string + (" " * (width - string_len))
-
 def sanitize(string):
     "Removes all extraneous characters and control codes from the string."
     # For now, just removes newlines and whitespace, but will be used later to remove
@@ -52,69 +41,16 @@ def sanitize(string):
 
 def an(string, capitalize = False):
     "Prefixes a string with 'a ' or 'an ' where appropriate. Pass 'capitalize == True' to capitalize the article."
-    inf = inflect.engine()
-    string = capital(inf.a(string)) if capitalize == True else inf.a(string)
+    string = capital(grammar.article(string)) if capitalize == True else grammar.article(string)
 
     return string
 
 def ord(string):
     "Returns the ordinal (1 --> 1st) of the string. You can also pass numbers."
-    inf = inflect.engine()
-    return inf.ordinal(string)
+    return grammar.ordinal(string)
 
 def num_word(n):
-    inf = inflect.engine()
-    return inf.number_to_words(n)
-
-def wrap(string, width = 80, initial_indent = 0, subsequent_indent = 0):
-    str_list = string.split()
-    str_list.insert(0, " " * initial_indent)
-
-    output_list = []
-    output_string = ""
-    cur_len = 0
-
-    for i, word in enumerate(str_list):
-        space = " " if i > 1 else ""
-        cur_len += len(ansi.strip_ansi(word))
-        if i > 1:
-            cur_len += 1
-        if cur_len <= width:
-            output_string += space + word
-        else:
-            output_list.append(output_string)
-            cur_len = len(ansi.strip_ansi(word)) + subsequent_indent
-            output_string = (" " * subsequent_indent) + word
-
-    output_list.append(output_string)
-
-    return "\n".join(output_list)
+    return grammar.number_words(n)
 
 def plural(string):
-    inf = inflect.engine()
-    inf.classical(ancient = True)
-    return inf.plural(string)
-
-def message_token_pluralize(string, token, tar):
-    reg = re.search(r"(" + token + "\w+)", string)
-    if reg:
-        found_words = reg.groups()
-        for word in found_words:
-            tar_word = word[1:]
-            string = string.replace(word, tar.pluralize(tar_word))
-
-    return string
-
-def message_token_capitalize(string):
-    reg = re.search(r"(\+\w+)", string)
-    if reg:
-        found_words = reg.groups()
-        for word in found_words:
-            tar_word = word[1:]
-            string = string.replace(word, capital(tar_word))
-
-    return string
-
-def truncate(string, length):
-    string = str(string)
-    return string if len(string) <= length else f"{string[:length - 3]}..."
\ No newline at end of file
+    return grammar.plural(string)
@@ -0,0 +1,60 @@
+"""
+Rolling timing samples for hot code paths - movement, world ticks, and the like.
+
+Samples are kept in memory only, and can be reviewed in-game with the
+|Rtimings|n command.
+"""
+# Python modules.
+import time
+from collections import deque
+
+# How many recent samples to keep per key.
+_SAMPLE_SIZE = 200
+
+_TIMINGS = {}
+
+def record(key, elapsed):
+    "Stores a single sample, in seconds, under the given key."
+    samples = _TIMINGS.get(key)
+    if samples == None:
+        samples = _TIMINGS[key] = deque(maxlen = _SAMPLE_SIZE)
+
+    samples.append(elapsed)
+
+def summary(key):
+    "Returns (sample count, average, maximum, most recent) in seconds, or None if nothing's been recorded."
+    samples = _TIMINGS.get(key)
+    if not samples:
+        return None
+
+    return len(samples), sum(samples) / len(samples), max(samples), samples[-1]
+
+def timing_keys():
+    return sorted(_TIMINGS.keys())
+
+def reset(key = None):
+    if key:
+        _TIMINGS.pop(key, None)
+    else:
+        _TIMINGS.clear()
+
+class Timer():
+    """
+    Context manager that records how long its block took.
+
+        with Timer("move"):
+            ...
+    """
+    def __init__(self, key):
+        self.key = key
+        self.start = 0
+        self.elapsed = 0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.elapsed = time.perf_counter() - self.start
+        record(self.key, self.elapsed)
+        return False
@@ -0,0 +1,168 @@
+"""
+Zone climate.
+
+Each zone's rooms are kept in NumPy arrays - temperature, water level and light -
+and advanced a whole zone at a time by step(), which the world tick calls through
+Zone.update(). The values a builder sets on a room (db.temperature, db.water_level,
+db.illumination) are its baseline; the live values drift around them and are never
+written back to the database.
+
+Temperature follows the time of day and the season, pulled towards the baseline.
+Indoor rooms only feel a fraction of the swing, and insulated rooms none at all.
+Water spreads from rooms holding more to their neighbours along exits, downhill
+more readily than up, and drains back towards each room's baseline. Outdoor rooms
+are lit by daylight, indoor ones by their baseline illumination only.
+"""
+# Python modules.
+import math
+
+import numpy as np
+
+# Blackbirds modules.
+from data import exits as ex
+from world import clock, spatial
+
+# Room attributes the climate is built from. Changing one rebuilds its zone's arrays.
+CLIMATE_ATTRIBUTES = ("temperature", "water_level", "illumination", "darkness", "indoors", "insulated", "exits")
+
+# Degrees C the temperature swings either side of the baseline over a day, and over a year.
+DAILY_SWING = 6.0
+SEASONAL_SWING = 10.0
+# Share of the outdoor swing felt indoors.
+INDOOR_SWING = 0.3
+# How quickly temperature closes on its target, per game hour.
+TEMPERATURE_RATE = 0.5
+# Share of the difference in water level that flows through an exit per game hour, and
+# the multiplier for water running downhill/uphill.
+FLOW_RATE = 0.2
+DOWNHILL = 2.0
+UPHILL = 0.1
+# How quickly water drains back to its baseline, per game hour.
+DRAIN_RATE = 0.05
+# Maximum light level, as used by illumination.
+MAX_LIGHT = 15
+# Maximum water level, as used by water_level.
+MAX_WATER = 15
+# Longest stretch of game time one step will simulate, in seconds.
+MAX_STEP = 6 * 60 * 60
+
+# Zone id -> ZoneClimate.
+_ZONES = {}
+
+def daylight(now = None):
+    "Returns how much daylight there is, from 0 (night) to 1 (noon)."
+    now = now or clock.now()
+    hour = now.hour + now.minute / 60
+    return max(0.0, math.sin(math.pi * (hour - 6) / 12))
+
+class ZoneClimate():
+    def __init__(self, zone, old = None):
+        self.zone_id = zone.id
+        self.version = spatial.zone_version(zone)
+        self.stepped_at = None
+
+        rooms = [room for room in zone.rooms() if room != None]
+        self.index = {room.id: i for i, room in enumerate(rooms)}
+
+        self.base_temp = np.array([room.db.temperature or 0 for room in rooms], dtype = float)
+        self.base_water = np.array([room.db.water_level or 0 for room in rooms], dtype = float)
+        self.base_light = np.array([room.db.illumination or 0 for room in rooms], dtype = float)
+        self.z = np.array([room.db.z or 0 for room in rooms], dtype = float)
+        self.dark = np.array([bool(room.db.darkness) for room in rooms], dtype = bool)
+        self.indoors = np.array([bool(room.db.indoors) for room in rooms], dtype = bool)
+        self.insulated = np.array([bool(room.db.insulated) for room in rooms], dtype = bool)
+
+        # How much of the weather each room feels.
+        self.exposure = np.where(self.insulated, 0.0, np.where(self.indoors, INDOOR_SWING, 1.0))
+
+        # The exit graph, as parallel arrays of (from, to) room indices within the zone.
+        src, dst = [], []
+        for i, room in enumerate(rooms):
+            for dest in room.exit_table()[0]:
+                j = self.index.get(dest) if dest != ex.NO_EXIT else None
+                if j != None:
+                    src.append(i)
+                    dst.append(j)
+
+        self.src = np.array(src, dtype = int)
+        self.dst = np.array(dst, dtype = int)
+        slope = self.z[self.dst] - self.z[self.src]
+        self.flow_scale = np.where(slope < 0, DOWNHILL, np.where(slope > 0, UPHILL, 1.0)) * FLOW_RATE
+
+        # Live state, carried over from the old arrays for rooms that were already here.
+        self.temp = self.base_temp.copy()
+        self.water = self.base_water.copy()
+        self.light = self.base_light.copy()
+        if old:
+            for room_id, i in self.index.items():
+                j = old.index.get(room_id)
+                if j != None:
+                    self.temp[i], self.water[i] = old.temp[j], old.water[j]
+            self.stepped_at = old.stepped_at
+
+    def step(self, now = None):
+        "Advances the whole zone to the current game time."
+        now = now or clock.now()
+        stamp = now.timestamp()
+        hours = min(stamp - self.stepped_at, MAX_STEP) / 3600 if self.stepped_at else 0
+        self.stepped_at = stamp
+
+        # Temperature: warmest mid-afternoon and mid-summer.
+        hour = now.hour + now.minute / 60
+        day = now.timetuple().tm_yday
+        swing = DAILY_SWING * math.cos(2 * math.pi * (hour - 15) / 24) + SEASONAL_SWING * math.cos(2 * math.pi * (day - 200) / 365)
+        target = self.base_temp + self.exposure * swing
+        if hours:
+            self.temp += (target - self.temp) * min(TEMPERATURE_RATE * hours, 1.0)
+        else:
+            self.temp = target
+
+        # Water: flows along exits from fuller rooms to emptier ones, then drains.
+        if hours and len(self.src):
+            flow = np.maximum(self.water[self.src] - self.water[self.dst], 0) * np.minimum(self.flow_scale * hours, 0.5)
+            delta = np.zeros_like(self.water)
+            np.add.at(delta, self.src, -flow)
+            np.add.at(delta, self.dst, flow)
+            self.water += delta
+        if hours:
+            self.water += (self.base_water - self.water) * min(DRAIN_RATE * hours, 1.0)
+        np.clip(self.water, 0, MAX_WATER, out = self.water)
+
+        # Light: daylight outdoors, on top of whatever lighting the room has.
+        sun = daylight(now) * MAX_LIGHT
+        self.light = np.where(self.dark, 0.0, np.where(self.indoors, self.base_light, np.maximum(self.base_light, sun)))
+
+def climate(zone):
+    "Returns the zone's ZoneClimate, (re)building it if the zone's rooms or exits have changed."
+    found = _ZONES.get(zone.id)
+    if not found or found.version != spatial.zone_version(zone):
+        found = ZoneClimate(zone, old = found)
+        _ZONES[zone.id] = found
+        found.step()
+
+    return found
+
+def step(zone):
+    "Advances the zone's climate. Called by the world tick, through Zone.update()."
+    climate(zone).step()
+
+def invalidate(zone):
+    "Rebuilds the zone's arrays on next use, keeping its current state. For changes to a room's baseline values."
+    spatial.touch_zone(zone)
+
+def room_value(room, field):
+    """
+    Returns the room's current temperature, water or light, or None if its zone has no
+    climate running yet (rooms then fall back on their baseline).
+    """
+    zone = room.db.zone
+    if not zone or zone.id not in _ZONES:
+        return None
+
+    found = climate(zone)
+
+    i = found.index.get(room.id)
+    if i == None:
+        return None
+
+    return float(getattr(found, field)[i])
@@ -0,0 +1,124 @@
+"""
+Game clock.
+
+Keeps track of the time of day in game time (see TIME_FACTOR and TIME_GAME_EPOCH in
+the settings), cut into the bands in PERIODS. Each band belongs to a phase - dawn,
+day, dusk or night - and carries the text rooms show for it. The current band is
+cached until the game time passes its end, so reading it is a comparison rather
+than a date calculation.
+
+Functions subscribed with subscribe() are called with (old phase, new phase) when
+the phase changes. The clock arms one reactor call for the next band boundary,
+started with start() at server start.
+"""
+# Python modules.
+from datetime import datetime
+
+# Evennia modules.
+from evennia.utils import gametime, logger
+from evennia.utils.utils import delay
+
+# Blackbirds modules.
+from server.conf import settings
+
+DAWN = "dawn"
+DAY = "day"
+DUSK = "dusk"
+NIGHT = "night"
+
+# (starting hour, phase, description), in order. Each band runs until the next one starts.
+PERIODS = (
+    (0, NIGHT, "|103The moon hangs high in the sky.|n"),
+    (4, DAWN, "|225A telltale bluish hue in the horizon tells of the oncoming dawn.|n"),
+    (6, DAY, "|431The sun begins to peek in the horizon.|n"),
+    (10, DAY, "|441Sunlight shines from the east as the Delight slowly climbs to its peak.|n"),
+    (12, DAY, "|550The Delight hangs at its peak, causing shadows to grow short.|n"),
+    (16, DUSK, "|441The sky begins to darken as the sun falls to the west.|n"),
+    (18, DUSK, "|225A smattering of stars join the moon in the sky.|n"),
+    (20, NIGHT, "|104Moonlight shines down upon you.|n"),
+)
+
+# What outdoor players see as a phase begins.
+PHASE_ECHOES = {
+    DAWN: "|225The eastern horizon pales with the coming dawn.|n",
+    DAY: "|431The sun rises over the horizon.|n",
+    DUSK: "|441The sun sinks towards the west, and the sky begins to darken.|n",
+    NIGHT: "|104Night falls, and the moon takes its place in the sky.|n",
+}
+
+# The current band's index in PERIODS, and the game timestamp it ends at.
+_PERIOD = None
+_PERIOD_ENDS = None
+_SUBSCRIBERS = []
+_STARTED = False
+
+def game_timestamp():
+    return gametime.gametime(absolute = True)
+
+def now():
+    "Returns the current game time, as a datetime."
+    return datetime.utcfromtimestamp(game_timestamp())
+
+def _band(stamp):
+    # Finds the band the game timestamp falls into, and the timestamp it ends at.
+    moment = datetime.utcfromtimestamp(stamp)
+    day_start = stamp - (moment.hour * 3600 + moment.minute * 60 + moment.second + moment.microsecond / 1000000)
+
+    index = 0
+    for i, (hour, _, _) in enumerate(PERIODS):
+        if moment.hour >= hour:
+            index = i
+
+    next_hour = PERIODS[index + 1][0] if index + 1 < len(PERIODS) else 24
+    return index, day_start + next_hour * 3600
+
+def _current():
+    # Returns the current band, moving on to the next (and telling subscribers) if it's over.
+    global _PERIOD, _PERIOD_ENDS
+    stamp = game_timestamp()
+    if _PERIOD != None and stamp < _PERIOD_ENDS:
+        return PERIODS[_PERIOD]
+
+    old_phase = PERIODS[_PERIOD][1] if _PERIOD != None else None
+    _PERIOD, _PERIOD_ENDS = _band(stamp)
+    new_phase = PERIODS[_PERIOD][1]
+
+    if old_phase != None and old_phase != new_phase:
+        for callback in list(_SUBSCRIBERS):
+            try:
+                callback(old_phase, new_phase)
+            except Exception:
+                logger.log_trace(f"Clock: {callback} failed on the change to {new_phase}.")
+
+    return PERIODS[_PERIOD]
+
+def phase():
+    "Returns the current phase: DAWN, DAY, DUSK or NIGHT."
+    return _current()[1]
+
+def time_string():
+    "Returns the description of the current time of day."
+    return _current()[2]
+
+def subscribe(callback):
+    "Calls callback(old phase, new phase) whenever the phase changes."
+    if callback not in _SUBSCRIBERS:
+        _SUBSCRIBERS.append(callback)
+
+def unsubscribe(callback):
+    if callback in _SUBSCRIBERS:
+        _SUBSCRIBERS.remove(callback)
+
+def _wake():
+    _current()
+
+    # Real seconds until the band's over, plus a little to land safely past the boundary.
+    wait = (_PERIOD_ENDS - game_timestamp()) / (settings.TIME_FACTOR or 1)
+    delay(max(wait, 0) + 0.1, _wake)
+
+def start():
+    "Starts watching for phase changes. Called at server start."
+    global _STARTED
+    if not _STARTED:
+        _STARTED = True
+        _wake()
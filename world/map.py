@@ -1,5 +1,11 @@
+# Python modules.
+import numpy as np
+
+# Blackbirds modules.
 from typeclasses.zones import Zone
 from utilities.display import header
+from utilities.room import get_room
+from world import spatial
 
 SYMBOLS = {
     None: " ",
@@ -7,16 +13,17 @@ SYMBOLS = {
     "shop": "$",
 }
 
-# For use with Map._populate_grid(); shifts exit directions appropriately.
+# Where each exit's glyph sits relative to its room, as (y, x) offsets on the
+# half-step grid, where rooms sit on even positions and the links between them on odd ones.
 DIR_SHIFT = {
-    "northwest": (0.5, -0.5),
-    "north": (0.5, 0),
-    "northeast": (0.5, 0.5),
-    "west": (0, -0.5),
-    "east": (0, 0.5),
-    "southwest": (-0.5, -0.5),
-    "south": (-0.5, 0),
-    "southeast": (-0.5, 0.5)
+    "northwest": (1, -1),
+    "north": (1, 0),
+    "northeast": (1, 1),
+    "west": (0, -1),
+    "east": (0, 1),
+    "southwest": (-1, -1),
+    "south": (-1, 0),
+    "southeast": (-1, 1)
 }
 
 DIR_SYM = {
@@ -30,8 +37,158 @@ DIR_SYM = {
     "southeast": "\\"
 }
 
+# Rooms per side of a map tile. Layers are split into tiles so that zones with
+# far-flung rooms don't render (and store) all the empty space in between.
+TILE_SIZE = 16
+
+# Cached MapLayers, keyed by (zone id, z).
+_LAYERS = {}
+
+def _blank_grid(rows, cols):
+    """
+    An empty grid of cells, with the first column a link column. Rooms are three
+    characters wide and links one, so blank cells alternate widths.
+    """
+    grid = np.empty((rows, cols), dtype = object)
+    grid[:, 0::2] = " "
+    grid[:, 1::2] = "   "
+    return grid
+
+# Every tile starts out from a copy of this - a tile's first column is always a link column.
+_BLANK_TILE = _blank_grid(TILE_SIZE * 2, TILE_SIZE * 2)
+
+def _room_cell(color, symbol = " "):
+    return "|%s[|n%s|%s]|n" % (color, symbol, color)
+
+def get_layer(zone, z):
+    "Returns the zone level's MapLayer, rendering it again only if the zone has changed since."
+    level = spatial.zone_level(zone, z)
+    version = spatial.zone_version(zone)
+
+    layer = _LAYERS.get((zone.id, z))
+    if not layer or layer.version != version:
+        layer = MapLayer(level, version)
+        _LAYERS[(zone.id, z)] = layer
+
+    return layer
+
+class MapLayer():
+    """
+    The static map of one z-level of a zone: room cells in their environment colors, and
+    exit glyphs. Rendered once, then sliced by every Map that views it.
+
+    Cells are addressed on a half-step grid (x2, y2), where a room at (x, y) sits at
+    (2x, 2y) and its links at the odd positions around it. A room owns its own cell plus
+    the link column to its west and the link row to its north; cells are grouped into
+    NumPy tiles by their owning room.
+    """
+    def __init__(self, level, version):
+        self.version = version
+        # (x, y) -> environment color of each drawn room, for overlays.
+        self.colors = {}
+        # (tile x, tile y) -> TILE_SIZE * 2 square array of cell strings, rows running north to south.
+        self.tiles = {}
+        # Room extents of the level, as (min x, max x, min y, max y).
+        self.bounds = None
+
+        room_x, room_y, room_color = [], [], []
+        link_x2, link_y2, link_glyph = [], [], []
+        for (x, y), room_id in level.items():
+            room = get_room(room_id)
+            if not room or room.db.hidden == True:
+                continue
+
+            for e_dir in room.get_exits(visible_only = True):
+                if e_dir in DIR_SHIFT:
+                    shift_y, shift_x = DIR_SHIFT[e_dir]
+                    link_x2.append(2 * x + shift_x)
+                    link_y2.append(2 * y + shift_y)
+                    link_glyph.append(DIR_SYM[e_dir])
+
+            room_x.append(x)
+            room_y.append(y)
+            room_color.append(room.environment_color())
+
+        if not room_x:
+            return
+
+        self.colors = dict(zip(zip(room_x, room_y), room_color))
+        self.bounds = (min(room_x), max(room_x), min(room_y), max(room_y))
+
+        # Render every cell string in one go: links first, so that rooms win any overlap.
+        room_color = np.array(room_color, dtype = str)
+        room_cells = np.char.add(np.char.add(np.char.add("|", room_color), "[|n |"), np.char.add(room_color, "]|n"))
+        link_cells = np.char.add(np.char.add("|w", np.array(link_glyph, dtype = str)), "|n")
+
+        x2 = np.concatenate((np.array(link_x2, dtype = int), 2 * np.array(room_x, dtype = int)))
+        y2 = np.concatenate((np.array(link_y2, dtype = int), 2 * np.array(room_y, dtype = int)))
+        cells = np.concatenate((link_cells.astype(object), room_cells.astype(object)))
+
+        tx = ((x2 + 1) // 2) // TILE_SIZE
+        ty = (y2 // 2) // TILE_SIZE
+        cols = x2 - (2 * tx * TILE_SIZE - 1)
+        rows = (2 * (ty + 1) * TILE_SIZE - 1) - y2
+
+        keys, owner = np.unique(np.stack((tx, ty), axis = 1), axis = 0, return_inverse = True)
+        owner = owner.reshape(-1)
+        for i, (k_x, k_y) in enumerate(keys):
+            tile = _BLANK_TILE.copy()
+            mask = owner == i
+            # Later entries win on duplicate positions, which keeps rooms over links.
+            tile[rows[mask], cols[mask]] = cells[mask]
+            self.tiles[(int(k_x), int(k_y))] = tile
+
+    def window(self, min_x2, max_x2, min_y2, max_y2):
+        """
+        Returns the cells between the given half-step bounds (inclusive) as a 2D array,
+        rows running north to south. min_x2 must be a link column.
+        """
+        grid = _blank_grid(max_y2 - min_y2 + 1, max_x2 - min_x2 + 1)
+
+        tx_min, tx_max = ((min_x2 + 1) // 2) // TILE_SIZE, ((max_x2 + 1) // 2) // TILE_SIZE
+        ty_min, ty_max = (min_y2 // 2) // TILE_SIZE, (max_y2 // 2) // TILE_SIZE
+        for (tx, ty), tile in self.tiles.items():
+            if not (tx_min <= tx <= tx_max and ty_min <= ty <= ty_max):
+                continue
+
+            # The tile's extents on the half-step grid.
+            t_min_x2 = 2 * tx * TILE_SIZE - 1
+            t_max_y2 = 2 * (ty + 1) * TILE_SIZE - 1
+
+            x_lo, x_hi = max(min_x2, t_min_x2), min(max_x2, t_min_x2 + TILE_SIZE * 2 - 1)
+            y_lo, y_hi = max(min_y2, t_max_y2 - TILE_SIZE * 2 + 1), min(max_y2, t_max_y2)
+
+            grid[max_y2 - y_hi:max_y2 - y_lo + 1, x_lo - min_x2:x_hi - min_x2 + 1] = \
+                tile[t_max_y2 - y_hi:t_max_y2 - y_lo + 1, x_lo - t_min_x2:x_hi - t_min_x2 + 1]
+
+        return grid
+
+def draw_zone(caller, zone, z_levels = None):
+    "Draws every room of the zone, one map per z-level. Used for builders' overviews."
+    if z_levels == None:
+        z_levels = spatial.zone_z_levels(zone)
+
+    maps = []
+    for z in z_levels:
+        layer = get_layer(zone, z)
+        if not layer.bounds:
+            continue
+
+        min_x, max_x, min_y, max_y = layer.bounds
+        maps.append(Map(caller, max_x - min_x + 1, max_y - min_y + 1, zone = zone,
+            x = (min_x + max_x) // 2, y = (min_y + max_y) // 2, z = z).draw_map())
+
+    return "\n".join(maps)
+
 class Map():
-    def __init__(self, caller, max_width = 9, max_height = 9):
+    """
+    A window onto the map, centered on the caller's room by default.
+
+    Width and height count rooms, and can be any size - the 9 x 9 room view and a
+    builder's overview of an entire zone use the same machinery. Pass zone, x, y and z
+    to center the window somewhere other than the caller.
+    """
+    def __init__(self, caller, max_width = 9, max_height = 9, zone = None, x = None, y = None, z = None):
         self.caller = caller
 
         # Keep the map's dimensions at an odd number, rounded up.
@@ -42,104 +199,50 @@ class Map():
         # Enforce minimum size of 3 x 3.
         max_width = 3 if max_width <= 3 else max_width
         max_height = 3 if max_height <= 3 else max_height
-        # Enforce maximum size of 19 x 19.
-        max_width = 19 if max_width > 19 else max_width
-        max_height = 19 if max_height > 19 else max_height
         self.max_width = max_width
         self.max_height = max_height
         self.x_range = int((self.max_width - 1) / 2)
         self.y_range = int((self.max_height - 1) / 2)
 
         # Coordinate handling.
-        self.orig_x = caller.x()
-        self.orig_y = caller.y()
-        self.orig_z = caller.z()
+        self.zone = zone if zone else caller.zone()
+        self.orig_x = x if x != None else caller.x()
+        self.orig_y = y if y != None else caller.y()
+        self.orig_z = z if z != None else caller.z()
         self.min_x = (self.orig_x - self.x_range)
         self.max_x = (self.orig_x + self.x_range)
         self.min_y = (self.orig_y - self.y_range)
         self.max_y = (self.orig_y + self.y_range)
 
-        # Stores the actual appearance of the map.
-        self.grid = self._create_grid()
-        self.rooms = self._get_zone_rooms(caller.zone())
-
-    def _create_grid(self):
-        # Populates self.grid with a blank slate, each node representing a potential room.
-        # Existent rooms get filled in appropriately, whereas we treat all blank space as
-        # 'the background.'
-
-        g_list = {}
-        # We create the table upside down, since higher y coordinates should be 'northward'.
-        for y in range(self.max_y, self.min_y - 1, -1):
-            g_list[y + 0.5] = {}
-            g_list[y] = {}
-            for x in range(self.min_x, self.max_x + 1):
-                g_list[y + 0.5][x - 0.5] = " "
-                g_list[y + 0.5][x] = "   "
-                g_list[y][x - 0.5] = " "
-                g_list[y][x] = "   "
-            g_list[y + 0.5][self.max_x + 0.5] = " "
-
-        g_list[self.min_y - 0.5] = {}
-        for x in range(self.min_x, self.max_x + 1):
-            g_list[self.min_y - 0.5][x - 0.5] = " "
-            g_list[self.min_y - 0.5][x] = "   "
-        g_list[self.min_y - 0.5][self.max_x + 0.5] = " "
-
-        return g_list
-
-    def _get_zone_rooms(self, id):
-        zone = self.caller.zone()
-        if not zone:
-            return {}
-
-        r_list = {}
-        for room in zone.rooms():
-            y, x, z = room.db.y, room.db.x, room.db.z
-            if self.min_y < y < self.max_y and self.min_x < x < self.max_x and room.db.z == self.caller.z() and room.db.hidden == False:
-                if y not in r_list.keys():
-                    r_list[y] = {}
-
-                r_list[y][x] = room
-
-        return r_list
-
-    def _populate_grid(self):
-        # Fill grid with appropriate rooms.
-        for y in range(self.min_y, self.max_y + 1):
-            for x in range(self.min_x, self.max_x + 1):
-                if y in self.rooms.keys() and x in self.rooms[y]:
-                    # Iterate over the room's exits to tag appropriate exit nodes with a symbol.
-                    for e_dir in self.rooms[y][x].get_exits(visible_only = True):
-                        shift_y, shift_x = 0, 0
-                        if e_dir in DIR_SHIFT:
-                            shift_y, shift_x = DIR_SHIFT[e_dir][0], DIR_SHIFT[e_dir][1]
-                            sym = DIR_SYM[e_dir]
-                            self.grid[y + shift_y][x + shift_x] = f"|w{sym}|n"
-
-                    # Set the room's node to its environment color.
-                    color = self.rooms[y][x].environment_color()
-                    cen_sym = "|M@|n" if y == self.caller.y() and x == self.caller.x() else " "
-                    self.grid[y][x] = "|%s[|n%s|%s]|n" % (color, cen_sym, color)
+    def _grid(self):
+        # Slices the zone's pre-rendered layer down to our window, then overlays the
+        # viewer's marker. Without a zone, we draw an empty grid.
+        min_x2, max_x2 = 2 * self.min_x - 1, 2 * self.max_x + 1
+        min_y2, max_y2 = 2 * self.min_y - 1, 2 * self.max_y + 1
 
-    def draw_map(self):
-        self._populate_grid()
+        if not self.zone:
+            return _blank_grid(max_y2 - min_y2 + 1, max_x2 - min_x2 + 1)
 
-        string = ""
-        string_row = ""
-        ply_x, ply_y = str(self.caller.x()), str(self.caller.y())
+        layer = get_layer(self.zone, self.orig_z)
+        grid = layer.window(min_x2, max_x2, min_y2, max_y2)
 
+        # Mark the caller's room, if they're standing somewhere on this window.
+        loc = self.caller.location
+        if loc and loc.zone() == self.zone and loc.db.z == self.orig_z:
+            c_x, c_y = loc.db.x, loc.db.y
+            if self.min_x <= c_x <= self.max_x and self.min_y <= c_y <= self.max_y and (c_x, c_y) in layer.colors:
+                grid[max_y2 - 2 * c_y, 2 * c_x - min_x2] = _room_cell(layer.colors[(c_x, c_y)], "|M@|n")
+
+        return grid
+
+    def draw_map(self):
         string_header = "|113%s|n\n" % ("-" * ((4 * self.max_width) + 2))
-        string_footer = header(f"x{ply_x}, y{ply_y}",
+        string_footer = header(f"x{self.orig_x}, y{self.orig_y}, z{self.orig_z}" if self.zone != self.caller.zone() or self.orig_z != self.caller.z() else f"x{self.orig_x}, y{self.orig_y}",
             width = (4 * self.max_width) + 2,
             color = "113",
             title_color = "314"
         )
 
-        for y in self.grid:
-            for x in self.grid[y]:
-                string_row += self.grid[y][x]
-            string += string_row + "\n"
-            string_row = ""
+        string = "".join("".join(row) + "\n" for row in self._grid())
 
-        return string_header + string + string_footer
\ No newline at end of file
+        return string_header + string + string_footer
@@ -0,0 +1,111 @@
+"""
+Room occupancy.
+
+Each room keeps an Occupancy in its ndb, sorting whatever it holds into connected
+players, other characters (NPCs, unpuppeted characters) and things, along with each
+one's visibility level. Broadcasts and room rendering read ready-made lists from it
+instead of filtering the room's contents every time.
+
+It's kept current by the rooms' at_object_receive/at_object_leave hooks and by
+move_to(), which calls relocate() even when hooks are skipped. Puppeting and
+visibility changes re-sort their character with refresh(). After a reload the ndb
+is gone, and the room simply rebuilds its Occupancy from its contents on first use.
+"""
+# Evennia modules.
+from evennia.utils.utils import inherits_from
+
+# Blackbirds modules.
+from server.conf import settings
+
+PLAYERS = "players"
+NPCS = "npcs"
+THINGS = "things"
+
+class Occupancy():
+    def __init__(self, contents = ()):
+        # Group name -> {obj: visibility}. Dicts keep arrival order.
+        self.groups = {PLAYERS: {}, NPCS: {}, THINGS: {}}
+        # Obj -> group name, so removal doesn't have to search every group.
+        self.where = {}
+        # (group names, visibility) -> ready-made tuple, dropped on any change.
+        self._lists = {}
+
+        for obj in contents:
+            self.add(obj)
+
+    def _group(self, obj):
+        if obj.has_account:
+            return PLAYERS
+        elif inherits_from(obj, settings.BASE_CHARACTER_TYPECLASS):
+            return NPCS
+
+        return THINGS
+
+    def add(self, obj):
+        "Adds the object, or re-sorts it if it's already here."
+        self.remove(obj)
+
+        group = self._group(obj)
+        self.groups[group][obj] = obj.visibility
+        self.where[obj] = group
+
+    def remove(self, obj):
+        group = self.where.pop(obj, None)
+        if group != None:
+            del self.groups[group][obj]
+
+        self._lists.clear()
+
+    def get(self, *groups, visibility = None):
+        """
+        Returns a tuple of everything in the given groups (all of them, by default),
+        optionally only those at exactly the given visibility level.
+        """
+        groups = groups or (PLAYERS, NPCS, THINGS)
+        key = (groups, visibility)
+
+        found = self._lists.get(key)
+        if found == None:
+            found = tuple(obj for g in groups for obj, v in self.groups[g].items() if visibility == None or v == visibility)
+            self._lists[key] = found
+
+        return found
+
+    @property
+    def players(self):
+        return self.get(PLAYERS)
+
+    def __contains__(self, obj):
+        return obj in self.where
+
+    def __len__(self):
+        return len(self.where)
+
+def _occupancy(location):
+    # Only rooms keep an occupancy; characters carrying things don't.
+    if location and hasattr(location, "occupancy"):
+        return location.occupancy()
+
+    return None
+
+def relocate(obj, source, destination):
+    "Moves the object from the source's occupancy to the destination's."
+    occ = _occupancy(source)
+    if occ != None:
+        occ.remove(obj)
+
+    occ = _occupancy(destination)
+    if occ != None:
+        occ.add(obj)
+
+def refresh(obj, location = None):
+    "Re-sorts the object in its location after a puppet or visibility change, or clears it out if it left."
+    location = location or obj.location
+    occ = _occupancy(location)
+    if occ == None:
+        return
+
+    if obj.location == location:
+        occ.add(obj)
+    else:
+        occ.remove(obj)
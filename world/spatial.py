@@ -0,0 +1,169 @@
+"""
+Spatial room index.
+
+Keeps an in-memory lookup of every room's position, organized as
+zone id -> z-level -> (x, y) -> room id. The map queries it by bounding box,
+so drawing a window only ever touches the cells inside that window, no matter
+how many rooms the zone holds.
+
+The index lives in server memory. Each zone is built lazily from its room list
+the first time it's queried, and is kept current afterwards by the room-editing
+code calling index_room()/unindex_room().
+
+Every zone also carries an edit counter, bumped whenever something drawn on its
+map or shown in its room titles changes (rooms moving, exits, environments, zone
+and area names), so rendered maps and room appearances can be cached against it.
+"""
+
+# Zone id -> {z: {(x, y): room id}}
+_INDEX = {}
+# Room id -> (zone id, z, x, y); lets us find and clear a room's old cell on moves.
+_POSITIONS = {}
+# Zone id -> edit counter.
+_VERSIONS = {}
+# Bumped by edits that can affect every zone at once, e.g. environment colors.
+_WORLD_VERSION = 0
+
+def _zone_id(zone):
+    if not zone:
+        return None
+
+    return zone if isinstance(zone, int) else zone.id
+
+def touch_zone(zone):
+    "Marks anything rendered from the zone (its map, its room titles) as out of date."
+    zone_id = _zone_id(zone)
+    if zone_id != None:
+        _VERSIONS[zone_id] = _VERSIONS.get(zone_id, 0) + 1
+
+def touch_room(room):
+    touch_zone(room.db.zone)
+
+def touch_world():
+    "Marks everything rendered from every zone as out of date."
+    global _WORLD_VERSION
+    _WORLD_VERSION += 1
+
+def zone_version(zone):
+    "Returns a value that changes whenever the zone's map does."
+    return _WORLD_VERSION, _VERSIONS.get(_zone_id(zone), 0)
+
+def _insert(room_id, zone_id, x, y, z):
+    _INDEX[zone_id].setdefault(z, {})[(x, y)] = room_id
+    _POSITIONS[room_id] = (zone_id, z, x, y)
+    touch_zone(zone_id)
+
+def _remove(room_id):
+    pos = _POSITIONS.pop(room_id, None)
+    if not pos:
+        return
+
+    zone_id, z, x, y = pos
+    touch_zone(zone_id)
+    level = _INDEX.get(zone_id, {}).get(z)
+    if level and level.get((x, y)) == room_id:
+        del level[(x, y)]
+
+def build_zone(zone):
+    "(Re)builds the index for a single zone from its room list."
+    zone_id = _zone_id(zone)
+    if zone_id is None:
+        return
+
+    for room_id in [r for r, pos in _POSITIONS.items() if pos[0] == zone_id]:
+        _remove(room_id)
+
+    _INDEX[zone_id] = {}
+    for room in zone.rooms():
+        if room != None: # In case of malformed entries.
+            _insert(room.id, zone_id, room.db.x, room.db.y, room.db.z)
+
+def clear_zone(zone):
+    "Drops a zone from the index entirely. It will be rebuilt on its next query."
+    zone_id = _zone_id(zone)
+    for room_id in [r for r, pos in _POSITIONS.items() if pos[0] == zone_id]:
+        _POSITIONS.pop(room_id)
+
+    _INDEX.pop(zone_id, None)
+    touch_zone(zone_id)
+
+def index_room(room):
+    "Places the room at its current zone and coordinates, removing it from wherever it was before."
+    _remove(room.id)
+
+    zone_id = _zone_id(room.db.zone)
+    if zone_id is None or zone_id not in _INDEX:
+        # Unbuilt zones pick the room up when they're first queried.
+        return
+
+    _insert(room.id, zone_id, room.db.x, room.db.y, room.db.z)
+
+def unindex_room(room):
+    _remove(room.id)
+
+def room_at(zone, x, y, z):
+    "Returns the id of the room at the given coordinates, or None."
+    zone_id = _zone_id(zone)
+    if zone_id is None:
+        return None
+
+    if zone_id not in _INDEX:
+        build_zone(zone)
+
+    return _INDEX[zone_id].get(z, {}).get((x, y))
+
+def zone_level(zone, z):
+    "Returns {(x, y): room id} for every indexed room on one z-level of the zone. Do not modify it."
+    zone_id = _zone_id(zone)
+    if zone_id is None:
+        return {}
+
+    if zone_id not in _INDEX:
+        build_zone(zone)
+
+    return _INDEX[zone_id].get(z, {})
+
+def zone_z_levels(zone):
+    "Returns the sorted z-levels that hold at least one room in the zone."
+    zone_id = _zone_id(zone)
+    if zone_id is None:
+        return []
+
+    if zone_id not in _INDEX:
+        build_zone(zone)
+
+    return sorted(z for z, level in _INDEX[zone_id].items() if level)
+
+def rooms_in_box(zone, z, min_x, max_x, min_y, max_y):
+    """
+    Returns {(x, y): room id} for every indexed room inside the inclusive bounding box.
+
+    Never touches more than the box's cell count, whatever the size of the zone.
+    """
+    zone_id = _zone_id(zone)
+    if zone_id is None:
+        return {}
+
+    if zone_id not in _INDEX:
+        build_zone(zone)
+
+    level = _INDEX[zone_id].get(z)
+    if not level:
+        return {}
+
+    found = {}
+    if len(level) < (max_x - min_x + 1) * (max_y - min_y + 1):
+        # Sparse level - cheaper to walk the rooms we have than every cell in the box.
+        for (x, y), room_id in level.items():
+            if min_x <= x <= max_x and min_y <= y <= max_y:
+                found[(x, y)] = room_id
+
+        return found
+
+    for y in range(min_y, max_y + 1):
+        for x in range(min_x, max_x + 1):
+            room_id = level.get((x, y))
+            if room_id != None:
+                found[(x, y)] = room_id
+
+    return found
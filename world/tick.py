@@ -0,0 +1,89 @@
+"""
+World tick.
+
+Every TICK_INTERVAL seconds, runs update() on the zones that have players in them,
+their rooms and areas, and every environment. The work is cut into slices of
+SLICE_SIZE objects, spread evenly across the interval, so a big world is updated
+a little at a time rather than all at once. Zones without players are skipped.
+
+Each slice is timed under the "world tick" key (see the |Rtimings|n command).
+Driven by the WorldTick script (typeclasses.scripts), started at server start.
+"""
+# Evennia modules.
+from evennia.server.sessionhandler import SESSION_HANDLER
+from evennia.utils import create, logger, search
+from evennia.utils.utils import delay
+
+# Blackbirds modules.
+from typeclasses.environments import Environment
+from utilities.timing import Timer
+
+# Seconds between world ticks.
+TICK_INTERVAL = 60
+# Objects updated per slice.
+SLICE_SIZE = 50
+SCRIPT_KEY = "world_tick"
+TIMING_KEY = "world tick"
+
+# Stats on the most recent tick, for admins.
+last_tick = {"zones": 0, "objects": 0, "slices": 0}
+
+def active_zones():
+    "Returns the zones that connected players are standing in."
+    zones = {}
+    for session in SESSION_HANDLER.get_sessions():
+        puppet = session.get_puppet()
+        location = puppet.location if puppet else None
+        zone = location.db.zone if location else None
+        if zone:
+            zones[zone.id] = zone
+
+    return list(zones.values())
+
+def _work(zones):
+    # Everything due an update this tick, zone by zone. Areas and environments are shared
+    # between zones, and are only updated once.
+    work, shared = [], {}
+    for zone in zones:
+        work.append(zone)
+        work.extend(room for room in zone.rooms() if room != None)
+
+        area = zone.area()
+        if area:
+            shared[area.id] = area
+
+    work.extend(shared.values())
+    work.extend(Environment.objects.all())
+    return work
+
+def _run_slice(objs):
+    with Timer(TIMING_KEY):
+        for obj in objs:
+            try:
+                obj.update()
+            except Exception:
+                logger.log_trace(f"World tick: update() failed on {obj}.")
+
+def run():
+    "Starts a world tick, scheduling its slices across the tick interval."
+    zones = active_zones()
+    work = _work(zones)
+    slices = [work[i:i + SLICE_SIZE] for i in range(0, len(work), SLICE_SIZE)]
+
+    last_tick["zones"] = len(zones)
+    last_tick["objects"] = len(work)
+    last_tick["slices"] = len(slices)
+
+    if not slices:
+        return
+
+    # The first slice runs right away; the rest follow evenly spaced, all done within the interval.
+    spacing = TICK_INTERVAL / len(slices)
+    _run_slice(slices[0])
+    for i, objs in enumerate(slices[1:], start = 1):
+        delay(i * spacing, _run_slice, objs)
+
+def start():
+    "Creates the WorldTick script, if it doesn't exist yet. Called at server start."
+    if not search.search_script(SCRIPT_KEY):
+        create.create_script("typeclasses.scripts.WorldTick", key = SCRIPT_KEY, persistent = True)